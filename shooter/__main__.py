@@ -1,25 +1,131 @@
+from argparse import ArgumentParser
+from time import monotonic
+
 import ppb
-from ppb import keycodes
+from ppb.assetlib import AssetLoadingSystem
+from ppb.systems import EventPoller
+from ppb.systems import SoundController
 
 from shooter import systems
-from shooter.events import Shoot
+from shooter.controls import inputs
+from shooter.scene import Lobby
 from shooter.scene import Splash
+from shooter.values import hitch_threshold
+from shooter.values import netplay_port
 from shooter.values import resolution
 
-inputs = [
-    systems.Axis("vertical", keycodes.Down, keycodes.Up),
-    systems.Axis("horizontal", keycodes.Left, keycodes.Right),
-    systems.Impulse("fire", keycodes.Space, Shoot)
+imports_finished = monotonic()
+
+parser = ArgumentParser(prog="shooter")
+parser.add_argument("--ai-worker", action="store_true",
+                    help="Plan Ace, Zero and EscortFrigate moves in a worker process.")
+parser.add_argument("--parallel-update", action="store_true",
+                    help="Update bullets, enemies and power ups on several threads "
+                         "on free-threaded Python.")
+parser.add_argument("--coop", metavar="HOST:PORT",
+                    help="Play co-op with the peer at HOST:PORT.")
+parser.add_argument("--coop-port", metavar="PORT", type=int, default=netplay_port,
+                    help="UDP port to take the co-op peer's inputs on, default %(default)s.")
+parser.add_argument("--coop-peer", type=int, choices=(0, 1), default=0,
+                    help="Which co-op player this is, the peer plays the other one.")
+parser.add_argument("--coop-seed", metavar="N", type=int, default=0,
+                    help="Random seed of the co-op game, the same on both peers.")
+parser.add_argument("--latency-report", metavar="PATH",
+                    help="Write input latency measurements to PATH on exit.")
+parser.add_argument("--telemetry", metavar="PATH",
+                    help="Record per frame metrics to PATH.")
+parser.add_argument("--metrics-port", metavar="PORT", type=int,
+                    help="Serve live metrics for Prometheus on localhost PORT.")
+parser.add_argument("--statsd", metavar="HOST:PORT",
+                    help="Push live metrics to a statsd server at HOST:PORT.")
+parser.add_argument("--startup-report", metavar="PATH",
+                    help="Write start up timings to PATH and quit once loaded.")
+parser.add_argument("--profile", metavar="PATH",
+                    help="Sample the game's stacks and write them to PATH in collapsed format.")
+parser.add_argument("--trace", metavar="PATH",
+                    help="Write every event dispatch to PATH as a Chrome trace on exit.")
+parser.add_argument("--hitch-report", metavar="PATH",
+                    help="Append a stack and scene summary to PATH for each long frame.")
+parser.add_argument("--hitch-threshold", metavar="SECONDS", type=float,
+                    default=hitch_threshold,
+                    help="Frames longer than this are hitches, default %(default)s.")
+
+gameplay_systems = [
+    "ControllerSystem",
+    "LifeCounter",
+    "EnemyLoader",
+    "PowerUp",
+    "ScoringSystem",
+    "EnemyComms",
+    "Effects",
+    "FrameBudgetScheduler",
+    "EntityBudget",
+    "PerfOverlay",
 ]
 
-with ppb.GameEngine(Splash,
-                    systems=[
-                        systems.ControllerSystem,
-                        systems.LifeCounter,
-                        systems.EnemyLoader,
-                        systems.PowerUp,
-                        systems.ScoringSystem,
-                        systems.EnemyComms,
-                    ],
-                    resolution=resolution, inputs=inputs) as ge:
-    ge.run()
+
+def main(argv=None):
+    args = parser.parse_args(argv)
+    first_scene = Splash
+    updater = systems.FixedStepUpdater
+    eager = []
+    gameplay = list(gameplay_systems)
+    if args.ai_worker:
+        # Started with the engine, so its worker process is never spawned
+        # from the middle of an Idle handler.
+        eager.append(systems.AIPlanner)
+    if args.parallel_update:
+        gameplay.append("ParallelUpdater")
+    if args.coop:
+        # The game runs in the rollback session, this engine only reads input and draws.
+        first_scene = Lobby
+        updater = systems.Netplay
+        eager = [systems.ControllerSystem]
+        gameplay = []
+    instrumentation = []
+    if args.latency_report:
+        instrumentation.append("InputLatency")
+    if args.telemetry:
+        instrumentation.append("Telemetry")
+    if args.metrics_port is not None or args.statsd:
+        instrumentation.append("Metrics")
+    monitors = []
+    if args.startup_report:
+        monitors.append(systems.StartupReport)
+    if args.hitch_report:
+        monitors.append(systems.HitchWatchdog)
+    if args.profile:
+        monitors.append(systems.SamplingProfiler)
+    if args.trace:
+        monitors.append(systems.EventTracer)
+
+    with ppb.GameEngine(first_scene,
+                        basic_systems=[
+                            updater,
+                            systems.InterpolatingRenderer,
+                            EventPoller,
+                            SoundController,
+                            AssetLoadingSystem,
+                        ],
+                        systems=[*eager, systems.DeferredSystems, *monitors],
+                        deferred_systems=[*gameplay, *instrumentation],
+                        resolution=resolution, inputs=inputs,
+                        coop=args.coop,
+                        coop_port=args.coop_port,
+                        coop_peer=args.coop_peer,
+                        coop_seed=args.coop_seed,
+                        latency_report=args.latency_report,
+                        telemetry_path=args.telemetry,
+                        metrics_port=args.metrics_port,
+                        statsd=args.statsd,
+                        startup_report=args.startup_report,
+                        imports_finished=imports_finished,
+                        hitch_report=args.hitch_report,
+                        hitch_threshold=args.hitch_threshold,
+                        profile=args.profile,
+                        trace=args.trace) as ge:
+        ge.run()
+
+
+if __name__ == "__main__":
+    main()
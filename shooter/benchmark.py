@@ -0,0 +1,219 @@
+"""
+Microbenchmarks for hot gameplay functions.
+
+Run with `python -m shooter.benchmark`. Each benchmark builds fresh state
+for every repeat and times many calls of one function. The number of calls
+per repeat is calibrated with `timeit`'s autorange. Results are saved
+under the current git commit in a JSON file, so later runs can be compared
+with `--compare REV`. A change is only called out when the 95% confidence
+intervals of the two runs do not overlap.
+"""
+import json
+import math
+import statistics
+import subprocess
+import timeit
+import warnings
+from argparse import ArgumentParser
+from pathlib import Path
+
+from ppb import GameEngine
+from ppb import Vector
+from ppb import events as ppb_events
+from ppb import keycodes
+
+from shooter import events as shooter_events
+from shooter import systems
+from shooter.scene import Game
+from shooter.systems.enemy import default_formations
+from shooter.sprites import gameplay as game_sprites
+from shooter.sprites import ui
+
+benchmarks = {}
+
+
+def benchmark(name):
+    """
+    Register a benchmark. The decorated function sets up state and returns
+    the zero argument callable to time.
+    """
+    def register(factory):
+        benchmarks[name] = factory
+        return factory
+    return register
+
+
+def ignore_signal(event):
+    pass
+
+
+def update_for(scene, time_delta=1 / 120):
+    update = ppb_events.Update(time_delta)
+    update.scene = scene
+    return update
+
+
+@benchmark("SpriteRoot.collides_with")
+def collides_with():
+    bullet = game_sprites.Bullet(position=Vector(0, 0))
+    ship = game_sprites.PatrolShip(position=Vector(0.4, 0.3))
+    return lambda: bullet.collides_with(ship)
+
+
+@benchmark("MoveMixin.move")
+def move():
+    bullet = game_sprites.Bullet(position=Vector(0, 0))
+    return lambda: bullet.move(1 / 120)
+
+
+@benchmark("Ace.maneuver")
+def ace_maneuver():
+    scene = Game()
+    scene.add(game_sprites.Player(position=Vector(0, -8)))
+    ace = game_sprites.Ace(position=Vector(1, 4))
+    scene.add(ace)
+    update = update_for(scene)
+
+    def maneuver():
+        # Keep weapons cooling down so this times steering and aiming.
+        ace.armed = True
+        ace.bullet_ready = ace.tri_missle_ready = False
+        ace.maneuver(update, ignore_signal)
+    return maneuver
+
+
+@benchmark("Zero.sensor_response")
+def zero_sensor_response():
+    player = game_sprites.Player(position=Vector(0, -8), heading=Vector(1, 0))
+    zero = game_sprites.Zero(position=Vector(2, 2))
+    return lambda: zero.sensor_response(player, ignore_signal)
+
+
+@benchmark("EndlessStrategy.spawn_formation")
+def spawn_formation():
+    scene = Game()
+    strategy = systems.Strategies.ENDLESS.value(default_formations)
+    strategy.danger = 160
+    return lambda: strategy.spawn_formation(scene)
+
+
+@benchmark("ControllerSystem.extend_update")
+def extend_update():
+    engine = GameEngine(Game, basic_systems=())
+    controller = systems.ControllerSystem(engine=engine, inputs=[
+        systems.Axis("vertical", keycodes.Down, keycodes.Up),
+        systems.Axis("horizontal", keycodes.Left, keycodes.Right),
+        systems.Impulse("fire", keycodes.Space, shooter_events.Shoot),
+    ])
+    update = ppb_events.Update(1 / 120)
+    return lambda: controller.extend_update(update)
+
+
+@benchmark("ui.Number.update_image")
+def number_update_image():
+    number = ui.Number(place=3)
+    return lambda: number.update_image(123456)
+
+
+def player_on_shoot(guns):
+    def factory():
+        scene = Game()
+        player = game_sprites.Player(guns=guns)
+        scene.add(player)
+        shoot = shooter_events.Shoot(scene=scene)
+        return lambda: player.on_shoot(shoot, ignore_signal)
+    return factory
+
+
+for gun_level in range(4):
+    benchmark(f"Player.on_shoot[guns={gun_level}]")(player_on_shoot(gun_level))
+
+
+def measure(factory, repeats):
+    number, _ = timeit.Timer(factory()).autorange()
+    samples = [
+        timeit.Timer(factory()).timeit(number) / number
+        for _ in range(repeats)
+    ]
+    mean = statistics.mean(samples)
+    spread = 1.96 * statistics.stdev(samples) / math.sqrt(repeats)
+    return {
+        "number": number,
+        "repeats": repeats,
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": mean,
+        "ci95": [mean - spread, mean + spread],
+    }
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, check=True,
+            text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def resolve_commit(revision):
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", revision], capture_output=True, check=True,
+            text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return revision
+
+
+def compare(name, result, baseline):
+    if baseline is None:
+        return ""
+    ratio = result["median"] / baseline["median"]
+    low, high = result["ci95"]
+    base_low, base_high = baseline["ci95"]
+    if low > base_high:
+        verdict = "slower"
+    elif high < base_low:
+        verdict = "faster"
+    else:
+        verdict = "same"
+    return f"  {ratio:5.2f}x {verdict}"
+
+
+parser = ArgumentParser(prog="python -m shooter.benchmark")
+parser.add_argument("names", nargs="*",
+                    help="Benchmarks to run, all by default.")
+parser.add_argument("--repeats", type=int, default=20,
+                    help="Samples per benchmark, at least 2 for a spread.")
+parser.add_argument("--results", default="benchmark_results.json",
+                    help="JSON file results are stored in, by commit.")
+parser.add_argument("--compare", metavar="REV",
+                    help="Compare with the stored results of a commit.")
+
+
+def main(argv=None):
+    args = parser.parse_args(argv)
+    if args.repeats < 2:
+        parser.error("--repeats must be at least 2")
+    # ppb.BaseSprite warns on every construction.
+    warnings.simplefilter("ignore", DeprecationWarning)
+    path = Path(args.results)
+    stored = json.loads(path.read_text()) if path.exists() else {}
+    baseline = dict(stored.get(resolve_commit(args.compare), {})) if args.compare else {}
+    commit = current_commit()
+    results = stored.setdefault(commit, {})
+
+    for name in args.names or benchmarks:
+        result = measure(benchmarks[name], args.repeats)
+        results[name] = result
+        print(f"{name:40} {result['median'] * 1e6:10.3f} us"
+              f" ±{(result['ci95'][1] - result['mean']) * 1e6:.3f}"
+              f"{compare(name, result, baseline.get(name))}")
+
+    path.write_text(json.dumps(stored, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+"""
+The game's control scheme, used by the game and the headless environments.
+"""
+from ppb import keycodes
+
+from shooter import systems
+from shooter.events import Shoot
+
+__all__ = [
+    "inputs",
+]
+
+inputs = [
+    systems.Axis("vertical", keycodes.Down, keycodes.Up),
+    systems.Axis("horizontal", keycodes.Left, keycodes.Right),
+    systems.Impulse("fire", keycodes.Space, Shoot)
+]
@@ -0,0 +1,227 @@
+"""
+A vectorized environment for bots and agents.
+
+Runs several independent `Game` scenes in one process and steps them
+together. Each environment is a headless `GameEngine` with the gameplay
+systems and no renderer, event poller or sound, driven one fixed tick at a
+time instead of by the wall clock.
+
+Requires numpy, which is not needed to play the game.
+"""
+from typing import Sequence
+
+import numpy
+
+from ppb import GameEngine
+from ppb import events as ppb_events
+from ppb import keycodes
+from ppb.systemslib import System
+
+from shooter import systems
+from shooter import values
+from shooter.controls import inputs
+from shooter.scene import Game
+from shooter.sprites import gameplay as game_sprites
+
+__all__ = [
+    "VectorEnv"
+]
+
+
+class EpisodeMonitor(System):
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.deaths = 0
+        self.game_over = False
+
+    def on_player_died(self, died, signal):
+        self.deaths += 1
+
+    def on_game_over(self, game_over, signal):
+        self.game_over = True
+
+
+gameplay_systems = (
+    systems.ControllerSystem,
+    systems.LifeCounter,
+    systems.EnemyLoader,
+    systems.PowerUp,
+    systems.ScoringSystem,
+    systems.EnemyComms,
+    systems.Effects,
+    systems.EntityBudget,
+    EpisodeMonitor,
+)
+
+axis_keys = {
+    "horizontal": (keycodes.Left, keycodes.Right),
+    "vertical": (keycodes.Down, keycodes.Up),
+}
+
+player_features = 6
+nearest_enemies = 8
+nearest_bullets = 8
+observation_size = player_features + 3 * (nearest_enemies + nearest_bullets)
+
+
+class Environment:
+    """
+    One headless game. Use through `VectorEnv`.
+    """
+
+    def __init__(self, time_step: float):
+        self.time_step = time_step
+        self.engine = GameEngine(Game, basic_systems=(),
+                                 systems=gameplay_systems, inputs=inputs)
+        self.engine.__enter__()
+        self.engine.start()
+        self.engine.signal(ppb_events.SceneStarted())
+        self.drain()
+        self.scoring = systems.find_system(self.engine, systems.ScoringSystem)
+        self.lives = systems.find_system(self.engine, systems.LifeCounter)
+        self.monitor = systems.find_system(self.engine, EpisodeMonitor)
+        self.effects = systems.find_system(self.engine, systems.Effects)
+        self.held = {name: None for name in axis_keys}
+        self.renderers = {}
+
+    def render(self, symbolic: bool):
+        renderer = self.renderers.get(symbolic)
+        if renderer is None:
+            renderer = self.renderers[symbolic] = systems.HeadlessRenderer(symbolic=symbolic)
+        scene = self.engine.current_scene
+        if symbolic:
+            return renderer.draw_symbols(scene)
+        renderer.draw(scene, self.effects.active(scene))
+        return renderer.pixels
+
+    def close(self):
+        self.engine.__exit__(None, None, None)
+
+    def drain(self):
+        engine = self.engine
+        while engine.events:
+            engine.publish()
+
+    def act(self, horizontal: int, vertical: int, fire: int):
+        for name, direction in (("horizontal", horizontal), ("vertical", vertical)):
+            negative, positive = axis_keys[name]
+            wanted = {-1: negative, 1: positive}.get(int(direction))
+            if wanted is self.held[name]:
+                continue
+            if self.held[name] is not None:
+                self.engine.signal(ppb_events.KeyReleased(self.held[name], set()))
+            if wanted is not None:
+                self.engine.signal(ppb_events.KeyPressed(wanted, set()))
+            self.held[name] = wanted
+        if fire:
+            self.engine.signal(ppb_events.KeyPressed(keycodes.Space, set()))
+        self.drain()
+
+    def tick(self):
+        self.engine.signal(ppb_events.Idle(self.time_step))
+        self.engine.signal(ppb_events.Update(self.time_step))
+        self.drain()
+
+    @property
+    def done(self):
+        return self.monitor.game_over or self.engine.current_scene is None
+
+    def observe(self, row):
+        row[:] = 0
+        scene = self.engine.current_scene
+        if scene is None:
+            return
+        player = next(scene.get(kind=game_sprites.Player), None)
+        origin = game_sprites.Player.position
+        if player is not None:
+            origin = player.position
+            row[0:6] = (origin.x, origin.y, 1, player.guns, player.engines,
+                        self.lives.lives)
+        else:
+            row[5] = self.lives.lives
+        offset = player_features
+        for group, limit in ((scene.get(kind=game_sprites.EnemyShip), nearest_enemies),
+                             (scene.get(layer=values.layer_enemy_bullet), nearest_bullets)):
+            nearest = sorted(
+                (sprite.position - origin for sprite in group),
+                key=lambda relative: relative.length
+            )[:limit]
+            for index, relative in enumerate(nearest):
+                start = offset + 3 * index
+                row[start:start + 3] = (relative.x, relative.y, 1)
+            offset += 3 * limit
+
+
+class VectorEnv:
+    """
+    Steps `count` independent games together.
+
+    Actions are an integer array of shape (count, 3): horizontal and
+    vertical direction in -1, 0 or 1, and fire as 0 or 1. Actions are fed
+    through each game's `ControllerSystem` as key events and held for
+    `frame_skip` ticks.
+
+    `step` returns observations, rewards, dones and infos. Rewards are
+    score gained less `death_penalty` per `PlayerDied`. Finished games are
+    reset automatically, their observation row is the new game's.
+    """
+
+    def __init__(self, count: int, *, frame_skip: int = 4,
+                 time_step: float = 1 / values.simulation_rate,
+                 death_penalty: float = 100):
+        self.count = count
+        self.frame_skip = frame_skip
+        self.time_step = time_step
+        self.death_penalty = death_penalty
+        self.environments = [Environment(time_step) for _ in range(count)]
+        self.observations = numpy.zeros((count, observation_size), dtype=numpy.float32)
+
+    def reset(self) -> numpy.ndarray:
+        for index in range(self.count):
+            self.reset_one(index)
+        return self.observations.copy()
+
+    def reset_one(self, index: int):
+        self.environments[index].close()
+        self.environments[index] = Environment(self.time_step)
+        self.environments[index].observe(self.observations[index])
+
+    def step(self, actions: Sequence):
+        actions = numpy.asarray(actions, dtype=numpy.int64).reshape(self.count, 3)
+        rewards = numpy.zeros(self.count, dtype=numpy.float32)
+        dones = numpy.zeros(self.count, dtype=bool)
+        infos = []
+        for index, environment in enumerate(self.environments):
+            deaths = environment.monitor.deaths
+            environment.act(*actions[index])
+            for _ in range(self.frame_skip):
+                score = environment.scoring.score
+                environment.tick()
+                if environment.done:
+                    # Game over resets the score, so the last tick earns nothing.
+                    break
+                rewards[index] += environment.scoring.score - score
+            rewards[index] -= self.death_penalty * (environment.monitor.deaths - deaths)
+            dones[index] = environment.done
+            infos.append({"score": environment.scoring.score,
+                          "lives": environment.lives.lives})
+            if dones[index]:
+                self.reset_one(index)
+            else:
+                environment.observe(self.observations[index])
+        return self.observations.copy(), rewards, dones, infos
+
+    def render(self, symbolic: bool = False) -> list:
+        """
+        Draw every game with a `HeadlessRenderer`.
+
+        Returns one array per game: pixels of shape (height, width, 3), or
+        with symbolic a grid of sprite codes. The arrays view each
+        renderer's buffer and are overwritten by the next call.
+        """
+        return [environment.render(symbolic) for environment in self.environments]
+
+    def close(self):
+        for environment in self.environments:
+            environment.close()
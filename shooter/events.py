@@ -1,12 +1,21 @@
+import sys
 from abc import ABC
 from abc import abstractmethod
 from dataclasses import dataclass
+from functools import partial
 from typing import Any
 from typing import Iterable
 
 
 from ppb import BaseSprite
 
+# Events are made by the thousand, so they hold their fields in slots
+# rather than a per instance dict where Python supports it.
+if sys.version_info >= (3, 10):
+    event = partial(dataclass, slots=True)
+else:
+    event = dataclass
+
 
 class Scene(ABC):
 
@@ -20,61 +29,79 @@ class Scene(ABC):
     def remove(self, game_object: Any) -> None: ...
 
 
-@dataclass
+@event
 class EnemiesClear:
     scene: Scene = None
 
 
-@dataclass
+@event
 class EnemyAlerted:
     source: Any
     scene: Scene = None
 
 
-@dataclass
+@event
 class EnemyKilled:
     enemy: Any
     scene: Scene = None
 
 
-@dataclass
+@event
 class EnemyEscaped:
     enemy: Any
     scene: Scene = None
 
 
-@dataclass
+@event
 class GameOver:
     scene: Scene = None
 
 
-@dataclass
+@event
 class PlayerDied:
     scene: Scene = None
 
 
-@dataclass
+@event
 class PowerUp:
     kind: Any
     scene: Scene = None
+    # The player that picked it up, or None for every player.
+    player: Any = None
 
 
-@dataclass
+@event
 class ScoreChange:
     score: int
     debug: str = "Score change"
+    scene: Scene = None
 
 
-@dataclass
+@event
 class SetLives:
     scene: Scene = None
 
 
-@dataclass
+@event
 class Shoot:
     scene: Scene = None
+    # Which player fires, in co-op.
+    peer: int = 0
+
+
+@event
+class SpawnEffect:
+    effect: str
+    position: Any
+    end_event: Any = None
+    scene: Scene = None
 
 
-@dataclass
+@event
 class SpawnPlayer:
     scene: Scene = None
+
+
+@event
+class SystemsLoaded:
+    scene: Scene = None
@@ -0,0 +1,59 @@
+"""
+Packages whose submodules are imported on first attribute access.
+
+`lazy_exports` reads the `__all__` list at the top of each submodule's
+source, without importing it, and returns the module level `__getattr__`
+and `__dir__` that import a submodule when one of its names is first used.
+"""
+import os
+import re
+import sys
+from importlib import import_module
+
+__all__ = [
+    "lazy_exports",
+]
+
+all_pattern = re.compile(r"^__all__ = \[(.*?)\]", re.MULTILINE | re.DOTALL)
+name_pattern = re.compile(r"[\"'](\w+)[\"']")
+
+
+def exported_names(file_name: str) -> list:
+    with open(file_name, encoding="utf-8") as source:
+        match = all_pattern.search(source.read())
+    if match is None:
+        return []
+    return name_pattern.findall(match.group(1))
+
+
+def submodules(path):
+    for directory in path:
+        for file_name in sorted(os.listdir(directory)):
+            module, extension = os.path.splitext(file_name)
+            if extension == ".py" and module != "__init__":
+                yield module, os.path.join(directory, file_name)
+
+
+def lazy_exports(package: str, path):
+    """
+    Map every name in the `__all__` of the submodules on `path` to its
+    submodule, and return that with the package's `__getattr__` and
+    `__dir__`.
+    """
+    modules = {
+        name: module
+        for module, file_name in submodules(path)
+        for name in exported_names(file_name)
+    }
+
+    def __getattr__(name):
+        if name not in modules:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(import_module(f"{package}.{modules[name]}"), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__():
+        return sorted([*vars(sys.modules[package]), *modules])
+
+    return modules, __getattr__, __dir__
@@ -0,0 +1,126 @@
+"""
+Memory report.
+
+Run with `python -m shooter.memory`. It plays a headless game with random
+inputs for a while, then prints the bytes per instance and the total for
+every sprite class in the live scene, and the size of each event class.
+
+`memory_report` works on any scene, for example the one in a debugger.
+Sizes are shallow: the object, its attribute dict if it has one, and the
+numbers, vectors and lists it holds that are not shared with its class.
+Python builds an object's attribute dict the first time it is read, so
+measure a scene once, at the end.
+"""
+import dataclasses
+import random
+import sys
+from argparse import ArgumentParser
+from collections import defaultdict
+from typing import NamedTuple
+
+from ppb import Vector
+
+from shooter import events
+from shooter import values
+
+owned_types = (float, Vector, list, tuple)
+
+
+class ClassMemory(NamedTuple):
+    name: str
+    count: int
+    total: int
+
+    @property
+    def per_instance(self) -> float:
+        return self.total / self.count
+
+
+def attributes(obj):
+    if hasattr(obj, "__dict__"):
+        yield from vars(obj).items()
+    for kind in type(obj).__mro__:
+        for name in getattr(kind, "__slots__", ()):
+            if name not in ("__dict__", "__weakref__") and hasattr(obj, name):
+                yield name, getattr(obj, name)
+
+
+def instance_size(obj, seen: set) -> int:
+    """
+    Bytes held by obj, not counting anything already in seen.
+    """
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(vars(obj))
+    kind = type(obj)
+    for name, value in attributes(obj):
+        if (isinstance(value, owned_types) and id(value) not in seen
+                and value is not getattr(kind, name, None)):
+            seen.add(id(value))
+            size += sys.getsizeof(value)
+    return size
+
+
+def memory_report(scene):
+    """
+    A `ClassMemory` per sprite class in scene, largest total first.
+    """
+    totals = defaultdict(int)
+    counts = defaultdict(int)
+    seen = set()
+    for sprite in scene:
+        name = type(sprite).__name__
+        counts[name] += 1
+        totals[name] += instance_size(sprite, seen)
+    report = [ClassMemory(name, counts[name], totals[name]) for name in counts]
+    return sorted(report, key=lambda row: -row.total)
+
+
+def event_sizes():
+    """
+    (name, bytes) for an instance of each event in `shooter.events`.
+    """
+    for name in dir(events):
+        kind = getattr(events, name)
+        if not (isinstance(kind, type) and dataclasses.is_dataclass(kind)):
+            continue
+        required = [f for f in dataclasses.fields(kind)
+                    if f.default is dataclasses.MISSING]
+        yield name, instance_size(kind(*[None] * len(required)), set())
+
+
+def print_report(report, title="Sprites"):
+    print(f"{title + ':':16} {'count':>7} {'bytes each':>11} {'total':>9}")
+    for row in report:
+        print(f"{row.name:16} {row.count:7} {row.per_instance:11.0f} {row.total:9}")
+    print(f"{'all':16} {sum(r.count for r in report):7} {'':11} {sum(r.total for r in report):9}")
+
+
+parser = ArgumentParser(prog="python -m shooter.memory")
+parser.add_argument("--seconds", type=float, default=60,
+                    help="Simulated seconds to play before measuring, default %(default)s.")
+parser.add_argument("--seed", type=int, default=0)
+
+
+def main(argv=None):
+    from shooter.env import Environment
+
+    args = parser.parse_args(argv)
+    random.seed(args.seed)
+    environment = Environment(1 / values.simulation_rate)
+    for tick in range(int(args.seconds * values.simulation_rate)):
+        if tick % 30 == 0:
+            environment.act(random.randint(-1, 1), random.randint(-1, 1), 1)
+        environment.tick()
+        if environment.done:
+            break
+    print_report(memory_report(environment.engine.current_scene))
+    print()
+    print(f"{'Events:':16} {'bytes each':>11}")
+    for name, size in event_sizes():
+        print(f"{name:16} {size:11}")
+    environment.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,441 @@
+"""
+Rollback netplay for two player co-op.
+
+Each peer runs its own headless simulation of the `Game` scene with two
+`Player` ships, and the peers send each other nothing but their input
+states: the controller's horizontal and vertical axes and whether fire was
+pressed, one byte per tick.
+
+A peer never waits for the other's input. Its own input is applied
+`input_delay` ticks after it is read, and the other player's is predicted
+to stay as it last was, without firing. When the real input arrives and
+differs from the prediction, the scene is restored from the snapshot taken
+before that tick and every tick since is simulated again. A peer that gets
+`max_rollback` ticks ahead of the last input it has from the other stops
+and waits for it.
+
+Rollback only works if both peers compute the same ticks from the same
+inputs. Each session keeps its own stream of the `random` module, the
+scene visits sprites in the order they were added, and every
+`values.netplay_checksum_interval` ticks the peers swap a checksum of the
+scene to catch any difference.
+
+Packets are UDP datagrams of a header, the sender's last contiguous tick
+of the receiver's input, the sender's latest final checksum and the tick
+of its first input, followed by one byte per input from the first tick
+the receiver is missing. `LoopbackTransport` stands in for `UdpTransport`
+within one process.
+
+Run `python -m shooter.netplay` to play two peers against each other with
+random inputs over a loopback transport and report how often they roll
+back and whether they stay in sync.
+"""
+import random
+import socket
+import struct
+from argparse import ArgumentParser
+from collections import deque
+from contextlib import contextmanager
+from time import perf_counter
+from zlib import crc32
+
+from ppb import GameEngine
+from ppb import events as ppb_events
+
+from shooter import systems
+from shooter import values
+from shooter.events import Shoot
+from shooter.scene import Game
+from shooter.snapshot import capture_state
+from shooter.snapshot import restore_state
+from shooter.systems.controller import Controls
+
+__all__ = [
+    "pack_input",
+    "unpack_input",
+    "state_checksum",
+    "LoopbackTransport",
+    "UdpTransport",
+    "RollbackSession",
+]
+
+FIRE = 1 << 4
+NEUTRAL = 0b0101
+
+# Last contiguous tick of your input, checksum tick, checksum, first input
+# tick, input count. Ticks of -1 mean none.
+header = struct.Struct("!iiIiB")
+max_inputs = 255
+
+session_systems = (
+    systems.LifeCounter,
+    systems.EnemyLoader,
+    systems.PowerUp,
+    systems.ScoringSystem,
+    systems.EnemyComms,
+    systems.Effects,
+    systems.EntityBudget,
+)
+
+
+def pack_input(horizontal: int, vertical: int, fire: bool) -> int:
+    horizontal = max(-1, min(1, horizontal))
+    vertical = max(-1, min(1, vertical))
+    return (horizontal + 1) | (vertical + 1) << 2 | (FIRE if fire else 0)
+
+
+def unpack_input(state: int):
+    """
+    (horizontal, vertical, fire) of a packed input state.
+    """
+    return (state & 3) - 1, (state >> 2 & 3) - 1, bool(state & FIRE)
+
+
+def state_checksum(scene) -> int:
+    """
+    A CRC of the kind, position and health of every sprite, in scene order.
+    """
+    checksum = 0
+    for sprite in scene:
+        position = sprite.position
+        state = (type(sprite).__name__, position.x, position.y, getattr(sprite, "health", None))
+        checksum = crc32(repr(state).encode(), checksum)
+    return checksum
+
+
+class LoopbackTransport:
+    """
+    An in process stand in for `UdpTransport`. `pair` makes both ends.
+
+    A packet is received `latency` calls to `receive` after it was sent,
+    and dropped with probability `loss`.
+    """
+
+    def __init__(self, latency: int = 0, loss: float = 0, seed: int = 0):
+        self.latency = latency
+        self.loss = loss
+        self.random = random.Random(seed)
+        self.inbox = deque()
+        self.polls = 0
+        self.other = None
+
+    @classmethod
+    def pair(cls, latency: int = 0, loss: float = 0, seed: int = 0):
+        first = cls(latency, loss, seed)
+        second = cls(latency, loss, seed + 1)
+        first.other, second.other = second, first
+        return first, second
+
+    def send(self, packet: bytes):
+        if self.random.random() >= self.loss:
+            other = self.other
+            other.inbox.append((other.polls + self.latency, packet))
+
+    def receive(self) -> list:
+        self.polls += 1
+        packets = []
+        while self.inbox and self.inbox[0][0] <= self.polls:
+            packets.append(self.inbox.popleft()[1])
+        return packets
+
+    def close(self):
+        pass
+
+
+class UdpTransport:
+    """
+    A non-blocking UDP socket bound to `local` that sends to `remote`, both
+    (host, port).
+    """
+
+    def __init__(self, local: tuple, remote: tuple):
+        self.remote = remote
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind(local)
+        self.socket.setblocking(False)
+
+    def send(self, packet: bytes):
+        try:
+            self.socket.sendto(packet, self.remote)
+        except OSError:
+            # Nobody listening yet, the inputs are sent again until acknowledged.
+            pass
+
+    def receive(self) -> list:
+        packets = []
+        while True:
+            try:
+                packets.append(self.socket.recv(header.size + max_inputs))
+            except BlockingIOError:
+                return packets
+            except OSError:
+                continue
+
+    def close(self):
+        self.socket.close()
+
+
+class RollbackSession:
+    """
+    One peer's simulation of a co-op game.
+
+    Call `advance` once per tick with this peer's input. `scene` and
+    `effects` are what to draw. Both peers must use the same `seed`,
+    `time_step` and `input_delay`.
+
+    `rollbacks` counts the restores, `resimulated` the ticks simulated
+    again, `stalls` the ticks spent waiting for the other peer, and
+    `desynced` is the first tick whose checksums differed, or None.
+    """
+
+    def __init__(self, peer: int, transport, *, seed: int = 0,
+                 time_step: float = 1 / values.simulation_rate,
+                 input_delay: int = values.netplay_input_delay,
+                 max_rollback: int = values.netplay_max_rollback):
+        self.peer = peer
+        self.transport = transport
+        self.time_step = time_step
+        self.input_delay = input_delay
+        self.max_rollback = max_rollback
+        self.controls = {}
+        self.frame = 0
+        # Input states by tick. Nobody has input before the delay.
+        self.local = dict.fromkeys(range(input_delay), NEUTRAL)
+        self.remote = dict.fromkeys(range(input_delay), NEUTRAL)
+        self.remote_confirmed = input_delay - 1
+        self.acknowledged = input_delay - 1
+        # The other player's input each tick was simulated with.
+        self.used = {}
+        # State at the start of each tick simulated on a prediction.
+        self.states = {}
+        self.rollback_to = None
+        self.checksums = {}
+        self.remote_checksums = {}
+        self.checked = -1
+        self.rollbacks = 0
+        self.resimulated = 0
+        self.stalls = 0
+        self.desynced = None
+
+        outside = random.getstate()
+        random.seed(seed)
+        self.random_state = random.getstate()
+        random.setstate(outside)
+
+        self.engine = GameEngine(Game, basic_systems=(), systems=session_systems, players=2)
+        self.engine.register(ppb_events.Update, systems.FixedStepUpdater.store_previous_positions)
+        with self.own_random():
+            self.engine.__enter__()
+            self.engine.start()
+            self.engine.signal(ppb_events.SceneStarted())
+            self.drain()
+        self.effects = systems.find_system(self.engine, systems.Effects)
+
+    @property
+    def scene(self):
+        return self.engine.current_scene
+
+    @property
+    def finished(self):
+        """
+        The game is over on a tick both peers agree on.
+        """
+        return self.scene is None and self.remote_confirmed >= self.frame - 1
+
+    def close(self):
+        self.engine.__exit__(None, None, None)
+        self.transport.close()
+
+    @contextmanager
+    def own_random(self):
+        outside = random.getstate()
+        random.setstate(self.random_state)
+        try:
+            yield
+        finally:
+            self.random_state = random.getstate()
+            random.setstate(outside)
+
+    def drain(self):
+        engine = self.engine
+        while engine.events:
+            engine.publish()
+
+    def advance(self, horizontal: int, vertical: int, fire: bool) -> bool:
+        """
+        Simulate the next tick. False when waiting for the other peer
+        instead, and the input is dropped.
+        """
+        with self.own_random():
+            self.poll()
+            if self.frame - self.remote_confirmed > self.max_rollback:
+                self.stalls += 1
+                self.send()
+                return False
+            self.local[self.frame + self.input_delay] = pack_input(horizontal, vertical, fire)
+            self.send()
+            if self.scene is not None:
+                self.simulate(self.frame)
+            self.frame += 1
+            self.prune()
+        return True
+
+    def poll(self):
+        for packet in self.transport.receive():
+            self.receive(packet)
+        if self.rollback_to is not None:
+            self.rollback(self.rollback_to)
+            self.rollback_to = None
+        self.check()
+
+    def receive(self, packet: bytes):
+        if len(packet) < header.size:
+            return
+        acknowledged, checked, checksum, first, count = header.unpack_from(packet)
+        self.acknowledged = max(self.acknowledged, acknowledged)
+        if checked >= 0:
+            self.remote_checksums[checked] = checksum
+        for frame, state in enumerate(packet[header.size:header.size + count], first):
+            if frame <= self.remote_confirmed or frame in self.remote:
+                continue
+            self.remote[frame] = state
+            used = self.used.get(frame)
+            if used is not None and used != state:
+                if self.rollback_to is None or frame < self.rollback_to:
+                    self.rollback_to = frame
+        while self.remote_confirmed + 1 in self.remote:
+            self.remote_confirmed += 1
+
+    def send(self):
+        final = self.final_checksum()
+        checked, checksum = (-1, 0) if final is None else (final, self.checksums[final])
+        first = self.acknowledged + 1
+        last = min(max(self.local) + 1, first + max_inputs)
+        inputs = bytes(self.local[frame] for frame in range(first, last))
+        self.transport.send(
+            header.pack(self.remote_confirmed, checked, checksum, first, len(inputs)) + inputs
+        )
+
+    def remote_input(self, frame: int) -> int:
+        state = self.remote.get(frame)
+        if state is None:
+            # Predict the other player holds the same direction and does not fire.
+            state = self.remote.get(self.remote_confirmed, NEUTRAL) & ~FIRE
+        return state
+
+    def simulate(self, frame: int):
+        remote = self.remote_input(frame)
+        if frame > self.remote_confirmed:
+            self.states[frame] = capture_state(self.engine), random.getstate()
+        self.used[frame] = remote
+        inputs = [None, None]
+        inputs[self.peer] = self.local[frame]
+        inputs[1 - self.peer] = remote
+
+        engine = self.engine
+        update = ppb_events.Update(self.time_step)
+        update.peer_controls = [self.peer_controls(state) for state in inputs]
+        for peer, state in enumerate(inputs):
+            if state & FIRE:
+                engine.signal(Shoot(peer=peer))
+        engine.signal(ppb_events.Idle(self.time_step))
+        engine.signal(update)
+        self.drain()
+        if frame % values.netplay_checksum_interval == 0 and self.scene is not None:
+            self.checksums[frame] = state_checksum(self.scene)
+
+    def peer_controls(self, state: int) -> Controls:
+        controls = self.controls.get(state)
+        if controls is None:
+            horizontal, vertical, _ = unpack_input(state)
+            controls = self.controls[state] = Controls(
+                {"horizontal": horizontal, "vertical": vertical}, state
+            )
+        return controls
+
+    def rollback(self, frame: int):
+        state, random_state = self.states[frame]
+        if self.scene is None:
+            # The game ended on a tick that was mispredicted.
+            self.engine.start_scene(Game, {})
+            self.drain()
+        restore_state(self.engine, state)
+        random.setstate(random_state)
+        self.rollbacks += 1
+        for tick in range(frame, self.frame):
+            if self.scene is None:
+                break
+            self.simulate(tick)
+            self.resimulated += 1
+
+    def final_checksum(self):
+        """
+        The newest checked tick that can no longer be rolled back.
+        """
+        final = [frame for frame in self.checksums if frame <= self.remote_confirmed]
+        return max(final, default=None)
+
+    def check(self):
+        for frame, checksum in self.remote_checksums.items():
+            if frame > self.remote_confirmed or frame not in self.checksums:
+                continue
+            if self.checksums[frame] != checksum and self.desynced is None:
+                self.desynced = frame
+            self.checked = max(self.checked, frame)
+        self.remote_checksums = {
+            frame: checksum for frame, checksum in self.remote_checksums.items()
+            if frame > self.checked
+        }
+
+    def prune(self):
+        oldest = min(self.remote_confirmed, self.acknowledged, self.frame - 1)
+        for table in (self.local, self.remote, self.used, self.states):
+            for frame in [frame for frame in table if frame < oldest]:
+                del table[frame]
+        self.checksums = {
+            frame: checksum for frame, checksum in self.checksums.items()
+            if frame >= self.checked
+        }
+
+
+parser = ArgumentParser(prog="python -m shooter.netplay")
+parser.add_argument("--seconds", type=float, default=60,
+                    help="Simulated seconds to play, default %(default)s.")
+parser.add_argument("--latency", type=int, default=6,
+                    help="Ticks each packet takes to arrive, default %(default)s.")
+parser.add_argument("--loss", type=float, default=0.05,
+                    help="Fraction of packets dropped, default %(default)s.")
+parser.add_argument("--seed", type=int, default=0)
+
+
+def main(argv=None):
+    args = parser.parse_args(argv)
+    inputs = random.Random(args.seed)
+    transports = LoopbackTransport.pair(args.latency, args.loss, args.seed)
+    sessions = [RollbackSession(peer, transport, seed=args.seed)
+                for peer, transport in enumerate(transports)]
+    held = [(0, 0), (0, 0)]
+    times = []
+    for tick in range(int(args.seconds * values.simulation_rate)):
+        for peer, session in enumerate(sessions):
+            if inputs.random() < 0.05:
+                held[peer] = inputs.randint(-1, 1), inputs.randint(-1, 1)
+            start = perf_counter()
+            session.advance(*held[peer], inputs.random() < 0.1)
+            times.append(perf_counter() - start)
+        if all(session.finished for session in sessions):
+            break
+    for peer, session in enumerate(sessions):
+        sync = (f"desynced at tick {session.desynced}" if session.desynced is not None
+                else f"in sync through tick {session.checked}")
+        print(f"peer {peer}: {session.frame} ticks, {session.rollbacks} rollbacks, "
+              f"{session.resimulated} ticks resimulated, {session.stalls} stalls, {sync}")
+        session.close()
+    times.sort()
+    print(f"advance: median {times[len(times) // 2] * 1000:.2f} ms, "
+          f"99th percentile {times[int(len(times) * 0.99)] * 1000:.2f} ms, "
+          f"max {times[-1] * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
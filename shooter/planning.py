@@ -0,0 +1,161 @@
+"""
+Enemy decisions, computed in a separate process.
+
+The game writes a compact snapshot of the world into a shared memory
+block: the player's position, heading and speed, and the kind and
+position of every planned enemy. `serve`, running in a worker process,
+is woken through a semaphore, reads the snapshot and writes one plan per
+enemy back into the same block.
+
+The math is plain floats, so the worker never touches ppb. The formulas
+match the sprites' inline versions, which remain the fallback when a plan
+is late.
+
+Block layout, as doubles:
+
+    request, last answered request, count, player x, player y,
+    player heading x, player heading y, player speed,
+    then `max_enemies` records of kind, x, y,
+    then `max_enemies` plans of `plan_size` values.
+"""
+from math import hypot
+
+from shooter import values
+
+__all__ = [
+    "ACE",
+    "ZERO",
+    "ESCORT",
+    "plan_lengths",
+    "block_size",
+    "layout",
+    "serve",
+]
+
+ACE = 1
+ZERO = 2
+ESCORT = 3
+
+# Values in each kind's plan.
+plan_lengths = {
+    ACE: 3,  # heading x, heading y, speed
+    ZERO: 2,  # heading x, heading y
+    ESCORT: 6,  # three volley targets, the last fired first
+}
+
+REQUEST = 0
+RESULT = 1
+COUNT = 2
+PLAYER = 3
+header_size = 8
+
+# Request number that tells the worker to stop.
+STOP = -1
+record_size = 3
+plan_size = max(plan_lengths.values())
+
+
+def layout(max_enemies: int):
+    """
+    Offsets of the enemy records and the plans, in doubles.
+    """
+    return header_size, header_size + max_enemies * record_size
+
+
+def block_size(max_enemies: int) -> int:
+    """
+    Size of the shared block in bytes.
+    """
+    _, plans = layout(max_enemies)
+    return (plans + max_enemies * plan_size) * 8
+
+
+def scaled(x: float, y: float, length: float):
+    # As `MutableVector.scale_to`.
+    if length == 0:
+        return 0.0, 0.0
+    current = hypot(x, y)
+    return length * x / current, length * y / current
+
+
+def ace_course(x: float, y: float, player_x: float, player_y: float):
+    """
+    Where an `Ace` steers to hold its attack range, as `Ace.maneuver`.
+    """
+    max_thrust = values.enemy_ace_max_thrust
+    towards_x = player_x - x
+    towards_y = player_y - y
+    scale_x, scale_y = scaled(towards_x, towards_y, max_thrust)
+    target_x = 0.0 - scale_x
+    target_y = 0.0 - scale_y
+    strength = (hypot(towards_x, towards_y) / values.enemy_ace_optimal_range) * max_thrust
+    scale_x, scale_y = scaled(towards_x, towards_y, strength)
+    target_x += scale_x
+    target_y += scale_y
+    for avoid in (max(2 - x, 0), max(x - 8, 0)):
+        scale_x, scale_y = scaled(avoid, 0, avoid ** 2)
+        target_x += scale_x
+        target_y += scale_y
+    heading_x, heading_y = scaled(target_x, target_y, 1)
+    return heading_x, heading_y, hypot(target_x, target_y)
+
+
+def zero_intercept(x: float, y: float, player_x: float, player_y: float,
+                   heading_x: float, heading_y: float, speed: float):
+    """
+    A `Zero`'s heading to lead the player, as `Zero.sensor_response`.
+    """
+    factor = speed * .25
+    lead_x = player_x + heading_x * factor - x
+    lead_y = player_y + heading_y * factor - y
+    return scaled(lead_x, lead_y, 1)
+
+
+def escort_volley(player_x: float, player_y: float):
+    """
+    An `EscortFrigate`'s three shot targets, popped from the end.
+    """
+    return player_x, player_y + 2, player_x, player_y, player_x, player_y - 2
+
+
+def plan_all(block, max_enemies: int):
+    records, plans = layout(max_enemies)
+    player_x, player_y, heading_x, heading_y, speed = block[PLAYER:PLAYER + 5]
+    for index in range(int(block[COUNT])):
+        start = records + index * record_size
+        kind, x, y = block[start:start + record_size]
+        try:
+            if kind == ACE:
+                plan = ace_course(x, y, player_x, player_y)
+            elif kind == ZERO:
+                plan = zero_intercept(x, y, player_x, player_y, heading_x, heading_y, speed)
+            else:
+                plan = escort_volley(player_x, player_y)
+        except ZeroDivisionError:
+            # The enemy is right on top of its target, leave it to the inline fallback.
+            plan = (float("nan"),)
+        start = plans + index * plan_size
+        for offset, value in enumerate(plan):
+            block[start + offset] = value
+
+
+def serve(name: str, max_enemies: int, wake):
+    """
+    The worker's loop: plan every snapshot it is woken for until the
+    request is `STOP`.
+    """
+    from multiprocessing import shared_memory
+
+    memory = shared_memory.SharedMemory(name=name)
+    block = memory.buf.cast("d")
+    try:
+        while True:
+            wake.acquire()
+            request = block[REQUEST]
+            if request == STOP:
+                break
+            plan_all(block, max_enemies)
+            block[RESULT] = request
+    finally:
+        block.release()
+        memory.close()
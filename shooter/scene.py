@@ -1,40 +1,150 @@
+from collections import defaultdict
+from itertools import chain
+
 from ppb import BaseScene
 from ppb.buttons import Primary
 from ppb.events import ButtonPressed
 from ppb.events import StartScene
 from ppb.events import ReplaceScene
 from ppb.events import Update
+from ppb.scenes import GameObjectCollection
 
 from shooter.events import SetLives
 from shooter.sprites import Start
-from shooter.systems import Strategies
+from shooter.timers import TimerWheel
 from shooter.values import color_dark
 from shooter.values import grid_pixel_size
+from shooter.values import layer_button
 from shooter.values import splash_length
 
 __all__ = [
-    "Splash"
+    "Splash",
+    "Lobby",
 ]
 
 
+def layer_bits(mask: int):
+    while mask:
+        bit = mask & -mask
+        yield bit
+        mask ^= bit
+
+
+class LayeredCollection(GameObjectCollection):
+    """
+    Also indexes game objects by the bits of their `category`.
+
+    `get(layer=mask)` finds everything in any layer of `mask`, looked up by
+    integer bit instead of hashing tag strings. It can be combined with
+    `kind` and `tag`.
+
+    Every group is a dict used as an ordered set, so game objects are
+    visited in the order they were added rather than by their address. Two
+    scenes given the same adds and removes, or one restored from a
+    snapshot, update their sprites in the same order.
+
+    This is a deliberate fork of ppb 0.7's `GameObjectCollection`, whose
+    groups are sets. It replaces every group, so it does not call the
+    parent's `__init__`, and it must be checked against ppb's internals
+    whenever ppb is upgraded.
+    """
+
+    def __init__(self):
+        self.all = {}
+        self.kinds = defaultdict(dict)
+        self.tags = defaultdict(dict)
+        self.layers = defaultdict(dict)
+
+    def add(self, game_object, tags=()):
+        if isinstance(tags, (str, bytes)):
+            raise TypeError("You passed a string instead of an iterable, "
+                            "this probably isn't what you intended.\n\n"
+                            "Try making it a tuple.")
+        self.all[game_object] = None
+        for kind in type(game_object).__mro__:
+            self.kinds[kind][game_object] = None
+        for tag in tags:
+            self.tags[tag][game_object] = None
+        for bit in layer_bits(getattr(game_object, "category", 0)):
+            self.layers[bit][game_object] = None
+
+    def remove(self, game_object):
+        del self.all[game_object]
+        for kind in type(game_object).__mro__:
+            del self.kinds[kind][game_object]
+        for members in self.tags.values():
+            members.pop(game_object, None)
+        for bit in layer_bits(getattr(game_object, "category", 0)):
+            self.layers[bit].pop(game_object, None)
+
+    def get(self, *, kind: type = None, tag=None, layer: int = None, **kwargs):
+        groups = []
+        if layer is not None:
+            if layer in self.layers:
+                groups.append(self.layers[layer])
+            else:
+                groups.append(dict.fromkeys(chain.from_iterable(
+                    self.layers[bit] for bit in layer_bits(layer)
+                )))
+        if kind is not None:
+            groups.append(self.kinds[kind])
+        if tag is not None:
+            groups.append(self.tags[tag])
+        if not groups:
+            raise TypeError("get() takes at least one keyword-only argument. 'kind', 'tag' or 'layer'.")
+        found, *others = groups
+        for other in others:
+            found = [game_object for game_object in found if game_object in other]
+        return iter(tuple(found))
+
+
 class BugFix(BaseScene):
+    """
+    Every scene has a `TimerWheel` as `timers`, turned by its `Update`
+    before the sprites update. Sprites with a `life_span` have `expire`
+    scheduled when they are added, and sprites without an `update_slot`
+    are given the scene's next one.
+
+    With a `ParallelUpdater` running, the sprites it handles are updated
+    next, in bands, before the rest of the sprites see the update.
+    """
+    container_class = LayeredCollection
+
+    @property
+    def layers(self):
+        return self.game_objects.layers
 
     def __init__(self, *args, **kwargs):
+        self.timers = TimerWheel()
+        self.next_update_slot = 0
         super().__init__(*args, **kwargs)
         self.main_camera.pixel_ratio = grid_pixel_size
 
+    def add(self, game_object, tags=()):
+        super().add(game_object, tags)
+        if getattr(game_object, "update_slot", 0) is None:
+            game_object.update_slot = self.next_update_slot
+            self.next_update_slot += 1
+        life_span = getattr(game_object, "life_span", None)
+        if life_span is not None:
+            self.timers.schedule(life_span, game_object, "expire")
+
+    def on_update(self, update: Update, signal):
+        self.timers.advance(update.time_delta, self, signal)
+        parallel = getattr(update, "parallel", None)
+        if parallel is not None:
+            parallel.update_bands(self, update, signal)
+
 
 class Splash(BugFix):
     background_color = (101, 78, 163)
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.run_time = 0
+        self.timers.schedule(splash_length, self, "finish")
 
-    def on_update(self, update: Update, signal):
-        self.run_time += update.time_delta
-        if self.run_time >= splash_length:
-            signal(ReplaceScene(Menu, kwargs={"red": 1}))  # Working around a bug.
+    def finish(self, scene, signal):
+        signal(ReplaceScene(Menu, kwargs={"red": 1}))  # Working around a bug.
 
 
 class Menu(BugFix):
@@ -42,12 +152,12 @@ class Menu(BugFix):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.add(Start(), tags=["option"])
+        self.add(Start())
 
     def on_button_pressed(self, button_press: ButtonPressed, signal):
         if button_press.button != Primary:
             return
-        for button in self.get(tag="option"):
+        for button in self.get(layer=layer_button):
             if (button.left < button_press.position.x < button.right
                     and button.top > button_press.position.y > button.bottom):
                 signal(StartScene(Game))
@@ -55,10 +165,19 @@ class Menu(BugFix):
 
 class Game(BugFix):
     background_color = color_dark
-    spawn_strategy = Strategies.ENDLESS
+    spawn_strategy = "ENDLESS"
     started = False
 
     def on_update(self, update: Update, signal):
+        super().on_update(update, signal)
         if not self.started:
             signal(SetLives())
             self.started = True
+
+
+class Lobby(BugFix):
+    """
+    The engine's own scene in co-op, which stays empty. The game runs in a
+    `RollbackSession` and `Netplay` draws that instead.
+    """
+    background_color = color_dark
@@ -0,0 +1,241 @@
+"""
+Save states for the `Game` scene.
+
+`take_snapshot` packs every sprite in the current scene, with its class,
+tags and instance attributes, together with the scene's timers and the
+state of the `EnemyLoader` strategy, `LifeCounter`, `PowerUp`,
+`ScoringSystem` and `Effects` systems, into a compact binary blob.
+`restore_snapshot` puts an engine back into that state in place.
+
+`capture_state` and `restore_state` do the same with the state as plain
+Python values, skipping the packing, for states kept in memory only a
+moment, like rollback's.
+
+Attributes are kept when they are numbers, strings, `Vector`s, enums,
+assets such as `Image`, events with such fields, other sprites in the
+scene, or lists of those. Anything else, like animations, is left to the
+class defaults. An event's scene is not kept, publishing sets it again.
+"""
+import marshal
+import zlib
+from dataclasses import fields
+from dataclasses import is_dataclass
+from enum import Enum
+from importlib import import_module
+
+from ppb import GameEngine
+from ppb import Vector
+from ppb.assetlib import Asset
+from ppb.camera import Camera
+
+from shooter import systems
+
+__all__ = [
+    "capture_state",
+    "restore_state",
+    "take_snapshot",
+    "restore_snapshot",
+]
+
+VERSION = 2
+
+VECTOR = 0
+ENUM = 1
+SPRITE = 2
+SEQUENCE = 3
+EVENT = 4
+ASSET = 5
+
+
+class Unsupported(Exception):
+    pass
+
+
+def class_path(kind: type) -> str:
+    return f"{kind.__module__}:{kind.__qualname__}"
+
+
+def load_class(path: str) -> type:
+    module, name = path.split(":")
+    return getattr(import_module(module), name)
+
+
+def simple_state(obj) -> dict:
+    return {
+        key: value for key, value in vars(obj).items()
+        if value is None or isinstance(value, (bool, int, float, str))
+    }
+
+
+class Encoder:
+
+    def __init__(self, sprites):
+        self.indices = {id(sprite): index for index, sprite in enumerate(sprites)}
+        self.classes = []
+        self.class_indices = {}
+
+    def class_index(self, kind: type) -> int:
+        if kind not in self.class_indices:
+            self.class_indices[kind] = len(self.classes)
+            self.classes.append(class_path(kind))
+        return self.class_indices[kind]
+
+    def encode(self, value):
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        if isinstance(value, Vector):
+            return VECTOR, value.x, value.y
+        if isinstance(value, Enum):
+            return ENUM, self.class_index(type(value)), value.name
+        if id(value) in self.indices:
+            return SPRITE, self.indices[id(value)]
+        if isinstance(value, (list, tuple)):
+            return SEQUENCE, [self.encode(item) for item in value]
+        if is_dataclass(value) and not isinstance(value, type):
+            # The scene is set again when the event is published.
+            return EVENT, self.class_index(type(value)), {
+                field.name: self.encode(getattr(value, field.name))
+                for field in fields(value) if field.name != "scene"
+            }
+        if isinstance(value, Asset):
+            return ASSET, self.class_index(type(value)), value.name
+        raise Unsupported(value)
+
+    def encode_attributes(self, obj) -> dict:
+        attributes = {}
+        for key, value in vars(obj).items():
+            try:
+                attributes[key] = self.encode(value)
+            except Unsupported:
+                continue
+        return attributes
+
+
+class Decoder:
+
+    def __init__(self, classes):
+        self.classes = [load_class(path) for path in classes]
+        self.sprites = []
+
+    def decode(self, value):
+        if not isinstance(value, tuple):
+            return value
+        marker = value[0]
+        if marker == VECTOR:
+            return Vector(value[1], value[2])
+        if marker == ENUM:
+            return self.classes[value[1]][value[2]]
+        if marker == SPRITE:
+            return self.sprites[value[1]]
+        if marker == SEQUENCE:
+            return [self.decode(item) for item in value[1]]
+        if marker == EVENT:
+            return self.classes[value[1]](**{
+                name: self.decode(field) for name, field in value[2].items()
+            })
+        if marker == ASSET:
+            return self.classes[value[1]](value[2])
+        raise ValueError(f"Unknown snapshot value {value!r}")
+
+    @staticmethod
+    def references(value):
+        return isinstance(value, tuple) and value[0] in (SPRITE, SEQUENCE, EVENT)
+
+
+def capture_state(engine: GameEngine) -> dict:
+    scene = engine.current_scene
+    sprites = [s for s in scene if not isinstance(s, Camera)]
+    encoder = Encoder(sprites)
+    tags = {id(sprite): [] for sprite in sprites}
+    for tag, members in scene.tags.items():
+        if tag == "main_camera":
+            continue
+        for sprite in members:
+            tags[id(sprite)].append(tag)
+
+    records = [
+        (encoder.class_index(type(sprite)), tags[id(sprite)],
+         encoder.encode_attributes(sprite))
+        for sprite in sprites
+    ]
+
+    loader = systems.find_system(engine, systems.EnemyLoader)
+    effects = systems.find_system(engine, systems.Effects)
+    state = {
+        "version": VERSION,
+        "scene": simple_state(scene),
+        "strategy": (encoder.class_index(type(loader.strategy)),
+                     simple_state(loader.strategy)),
+        "lives": simple_state(systems.find_system(engine, systems.LifeCounter)),
+        "power_up": simple_state(systems.find_system(engine, systems.PowerUp)),
+        "scoring": simple_state(systems.find_system(engine, systems.ScoringSystem)),
+        "effects": (effects.clock, [
+            (start, animation_id, encoder.encode(position), encoder.encode(end_event))
+            for effect_scene, start, animation_id, position, end_event in effects.effects
+            if effect_scene is scene
+        ]),
+        "timers": (scene.timers.tick, scene.timers.elapsed, [
+            (timer.due, None if timer.owner is scene else encoder.encode(timer.owner), timer.name)
+            for timer in scene.timers
+            if timer.owner is scene or id(timer.owner) in encoder.indices
+        ]),
+        "sprites": records,
+        # Last, so every class used above is listed.
+        "classes": encoder.classes,
+    }
+    return state
+
+
+def take_snapshot(engine: GameEngine) -> bytes:
+    return zlib.compress(marshal.dumps(capture_state(engine)), 1)
+
+
+def restore_state(engine: GameEngine, state: dict):
+    if state["version"] != VERSION:
+        raise ValueError(f"Snapshot version {state['version']} is not supported.")
+    scene = engine.current_scene
+    decoder = Decoder(state["classes"])
+
+    for sprite in list(scene):
+        if not isinstance(sprite, Camera):
+            scene.remove(sprite)
+
+    # Build every sprite first so references between them resolve.
+    deferred = []
+    for class_index, tags, attributes in state["sprites"]:
+        plain = {}
+        for key, value in attributes.items():
+            if decoder.references(value):
+                deferred.append((len(decoder.sprites), key, value))
+            else:
+                plain[key] = decoder.decode(value)
+        sprite = decoder.classes[class_index](**plain)
+        decoder.sprites.append(sprite)
+        scene.add(sprite, tags=tags)
+    for index, key, value in deferred:
+        setattr(decoder.sprites[index], key, decoder.decode(value))
+
+    vars(scene).update(state["scene"])
+    tick, elapsed, timers = state["timers"]
+    scene.timers.restore(tick, elapsed, [
+        (due, scene if owner is None else decoder.decode(owner), name)
+        for due, owner, name in timers
+    ])
+    loader = systems.find_system(engine, systems.EnemyLoader)
+    strategy_index, strategy_state = state["strategy"]
+    loader.strategy = decoder.classes[strategy_index](loader.formations)
+    vars(loader.strategy).update(strategy_state)
+    vars(systems.find_system(engine, systems.LifeCounter)).update(state["lives"])
+    vars(systems.find_system(engine, systems.PowerUp)).update(state["power_up"])
+    vars(systems.find_system(engine, systems.ScoringSystem)).update(state["scoring"])
+    effects = systems.find_system(engine, systems.Effects)
+    clock, active = state["effects"]
+    effects.clock = clock
+    effects.effects = [e for e in effects.effects if e[0] is not scene] + [
+        (scene, start, animation_id, decoder.decode(position), decoder.decode(end_event))
+        for start, animation_id, position, end_event in active
+    ]
+
+
+def restore_snapshot(engine: GameEngine, snapshot: bytes):
+    restore_state(engine, marshal.loads(zlib.decompress(snapshot)))
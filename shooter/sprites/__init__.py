@@ -1,3 +1,11 @@
-from shooter.sprites.root import *
-from shooter.sprites.gameplay import *
-from shooter.sprites.ui import *
\ No newline at end of file
+"""
+Game sprites.
+
+Submodules are imported on first attribute access, so the gameplay
+sprites and their images load only when something uses them.
+"""
+from shooter.lazy import lazy_exports
+
+modules, __getattr__, __dir__ = lazy_exports(__name__, __path__)
+
+__all__ = list(modules)
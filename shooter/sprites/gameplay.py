@@ -4,12 +4,14 @@ from ppb import Image
 from ppb import Sound
 from ppb import Vector
 from ppb import events as ppb_events
-from ppb.features.animation import Animation
 
 from shooter import values
 from shooter import events as shooter_events
 from shooter.sprites import SpriteRoot
-from shooter.sprites.root import RunOnceAnimation
+from shooter.sprites.root import UpdatePriority
+from shooter.sprites.root import admitted
+from shooter.sprites.root import schedule
+from shooter.vector import MutableVector
 
 
 # TODO: Add the player to the update event.
@@ -32,6 +34,14 @@ sounds = {
 }
 
 
+down = Vector(0, -1)
+
+enemy_bullet_layers = {
+    "category": values.layer_enemy_bullet,
+    "mask": values.layer_player | values.layer_shield,
+}
+
+
 class PowerUps(Enum):
     GUN = "gun"
     SHIELD = "shield"
@@ -43,7 +53,11 @@ class MoveMixin(SpriteRoot):
     heading = Vector(0, -1)
 
     def move(self, time_delta):
-        self.position += self.heading * time_delta * self.speed
+        position = self.position
+        heading = self.heading
+        speed = self.speed
+        self.position = Vector(position.x + heading.x * time_delta * speed,
+                               position.y + heading.y * time_delta * speed)
 
 
 class DamageMixin(SpriteRoot):
@@ -61,7 +75,8 @@ class Bullet(MoveMixin):
     size = 0.25
     speed = 10
     heading = Vector(0, 1)
-    target = "enemy"
+    category = values.layer_friendly_bullet
+    mask = values.layer_enemy
     intensity = 5
     image = Image("shooter/resources/bullet.png")
     kill = False
@@ -71,7 +86,7 @@ class Bullet(MoveMixin):
             update.scene.remove(self)
             return
         self.move(update.time_delta)
-        for target in update.scene.get(tag=self.target):
+        for target in update.scene.get(layer=self.mask):
             if self.collides_with(target):
                 self.kill = True
                 target.damage(self.intensity)
@@ -80,10 +95,12 @@ class Bullet(MoveMixin):
 
 
 class Alert(Bullet):
-    target = "there is none"
+    category = 0
+    mask = 0
     image = Image("shooter/resources/enemies/message.png")
     speed = 5
     size = 0.5
+    update_priority = UpdatePriority.COSMETIC
 
 
 class Beacon(MoveMixin):
@@ -91,12 +108,14 @@ class Beacon(MoveMixin):
     life_span = values.enemy_beacon_life_span
     image = Image("shooter/resources/enemies/beacon.png")
     size = 0.5
+    category = values.layer_beacon
+    mask = values.layer_enemy | values.layer_missile
+
+    def expire(self, scene, signal):
+        scene.remove(self)
 
     def on_update(self, update: ppb_events.Update, signal):
-        self.life_span -= update.time_delta
-        if self.life_span <= 0:
-            update.scene.remove(self)
-        for enemy in update.scene.get(kind=EnemyShip):
+        for enemy in update.scene.get(layer=self.mask):
             if (self.position - enemy.position).length < 1:
                 signal(shooter_events.EnemyAlerted(self))
                 update.scene.remove(self)
@@ -109,6 +128,10 @@ class EnemyShip(Ship):
     points = 1
     sensor_distance = 1
     player_spotted = False
+    category = values.layer_enemy
+    mask = values.layer_player
+    # Set by `AIPlanner` for the one update it applies to.
+    plan = None
 
     def on_update(self, update: ppb_events.Update, signal):
         if self.health <= 0:
@@ -118,7 +141,7 @@ class EnemyShip(Ship):
             update.scene.remove(self)
             signal(shooter_events.EnemyEscaped(self))
         self.move(update.time_delta)
-        for player in update.scene.get(kind=Player):
+        for player in update.scene.get(layer=self.mask):
             if self.collides_with(player):
                 self.damage(player.mass)
                 player.damage(self.mass)
@@ -165,7 +188,7 @@ class CargoShip(EnemyShip):
     def on_update(self, update: ppb_events.Update, signal):
         super().on_update(update, signal)
         if self.player_spotted and self.speed < self.max_speed:
-            self.speed *= values.enemy_cargo_acceleration
+            self.speed *= values.enemy_cargo_acceleration ** (update.time_delta / values.acceleration_time_step)
             if self.speed > self.max_speed:
                 self.speed = self.max_speed
 
@@ -174,9 +197,9 @@ class EscortFrigate(EnemyShip):
     health = values.enemy_escort_health
     image = Image("shooter/resources/enemies/escort.png")
     speed = values.enemy_escort_speed
-    cooldown_counter = 0
-    next_shot = 0
-    shots = []
+    shot_ready = True
+    # Each volley assigns its own list.
+    shots = ()
     shooting = False
     escorting = None
     points = values.enemy_escort_point_value
@@ -189,38 +212,49 @@ class EscortFrigate(EnemyShip):
             else:
                 self.escorting = None
         if self.escorting is not None:
-            target = (self.position - self.escorting.position).scale(3)
-            heading = Vector(0, -1) + (target - self.position)
-            self.heading = heading.normalize()
+            heading = MutableVector().assign(self.position).isub(self.escorting.position).scale(3)
+            heading.isub(self.position)
+            heading.y -= 1
+            self.heading = heading.normalize().freeze()
         else:
-            self.heading = Vector(0, -1)
+            self.heading = down
         super().on_update(update, signal)
-        self.cooldown_counter += update.time_delta
-        if self.cooldown_counter >= self.next_shot:
+        if self.shot_ready:
             if not self.shots:
-                players = list(update.scene.get(kind=Player))
+                players = list(update.scene.get(layer=values.layer_player))
                 if not players:
                     return
                 player = players.pop()
-                self.shots = [
-                    player.position + Vector(0, 2),
-                    player.position,
-                    player.position + Vector(0, -2)
-                ]
+                if self.plan is not None:
+                    self.shots = [
+                        Vector(self.plan[0], self.plan[1]),
+                        Vector(self.plan[2], self.plan[3]),
+                        Vector(self.plan[4], self.plan[5])
+                    ]
+                else:
+                    self.shots = [
+                        player.position + Vector(0, 2),
+                        player.position,
+                        player.position + Vector(0, -2)
+                    ]
             shot_target = self.shots.pop()
             shot_vector = shot_target - self.position
-            bullet = Bullet(
-                position=self.position,
-                heading=shot_vector.normalize(),
-                target="player"
-            )
-            bullet.facing = -shot_vector
-            update.scene.add(bullet)
-            self.cooldown_counter = 0
+            if admitted(update.scene, values.layer_enemy_bullet):
+                bullet = Bullet(
+                    position=self.position,
+                    heading=shot_vector.normalize(),
+                    **enemy_bullet_layers
+                )
+                bullet.facing = -shot_vector
+                update.scene.add(bullet)
+            self.shot_ready = False
             if self.shots:
-                self.next_shot = values.enemy_escort_volley_pause
+                schedule(update.scene, values.enemy_escort_volley_pause, self, "reload")
             else:
-                self.next_shot = values.enemy_escort_volley_cooldown
+                schedule(update.scene, values.enemy_escort_volley_cooldown, self, "reload")
+
+    def reload(self, scene, signal):
+        self.shot_ready = True
 
 
 class Zero(EnemyShip):
@@ -246,12 +280,16 @@ class Zero(EnemyShip):
         if self.player_spotted:
             self.health -= update.time_delta
             if self.speed < self.max_speed:
-                self.speed *= self.acceleration
+                self.speed *= self.acceleration ** (update.time_delta / values.acceleration_time_step)
                 if self.speed > self.max_speed:
                     self.speed = self.max_speed
 
     def sensor_response(self, player, signal):
-        self.heading = ((player.position + (player.heading * player.speed * .25)) - self.position).normalize()
+        if self.plan is not None:
+            self.heading = Vector(*self.plan)
+        else:
+            lead = MutableVector().assign(player.position).iadd(player.heading, player.speed * .25)
+            self.heading = lead.isub(self.position).normalize().freeze()
         self.facing = self.heading
 
 
@@ -264,7 +302,10 @@ class Ace(EnemyShip):
     target_attack_range = values.enemy_ace_optimal_range
     bullet_cool_down = values.enemy_ace_bullet_cool_down
     tri_missle_cool_down = values.enemy_ace_tri_missle_cool_down
-    tri_missle_counter = 0
+    # Cooldowns start once the Ace first attacks.
+    armed = False
+    bullet_ready = False
+    tri_missle_ready = False
     tri_missle_count = 2
     max_thrust = values.enemy_ace_max_thrust
 
@@ -275,64 +316,76 @@ class Ace(EnemyShip):
 
     def maneuver(self, update, signal):
         if self.health > values.enemy_ace_health / 2:
-            target_vector = Vector(0, 0)
+            target_vector = MutableVector()
+            towards = MutableVector()
+            scratch = MutableVector()
             # Slow and aim to be the target distance.
-            for player in update.scene.get(kind=Player):
+            for player in update.scene.get(layer=values.layer_player):
 
                 # Making moves
                 # TODO: Add some variance to this to keep Aces from locking in position.
-                from_player = self.position - player.position
-                target_vector += from_player.scale(self.max_thrust)
-                towards_player = player.position - self.position
-                strength_of_towards = (towards_player.length / self.target_attack_range) * self.max_thrust
-                target_vector += (player.position - self.position).scale(strength_of_towards)
-                avoid_left = max(2 - self.position.x, 0)
-                target_vector += Vector(avoid_left, 0).scale(avoid_left ** 2)
-                avoid_right = max(self.position.x - 8, 0)
-                target_vector += Vector(avoid_right, 0).scale(avoid_right ** 2)
-                self.heading = target_vector.normalize()
-                self.speed = target_vector.length
+                towards.assign(player.position).isub(self.position)
+                if self.plan is not None:
+                    heading_x, heading_y, self.speed = self.plan
+                    self.heading = Vector(heading_x, heading_y)
+                else:
+                    target_vector.isub(scratch.assign(towards).scale(self.max_thrust))
+                    strength_of_towards = (towards.length / self.target_attack_range) * self.max_thrust
+                    target_vector.iadd(scratch.assign(towards).scale(strength_of_towards))
+                    avoid_left = max(2 - self.position.x, 0)
+                    target_vector.iadd(scratch.set(avoid_left, 0).scale(avoid_left ** 2))
+                    avoid_right = max(self.position.x - 8, 0)
+                    target_vector.iadd(scratch.set(avoid_right, 0).scale(avoid_right ** 2))
+                    self.heading = scratch.assign(target_vector).normalize().freeze()
+                    self.speed = target_vector.length
 
                 # Attack time
+                if not self.armed:
+                    self.armed = True
+                    schedule(update.scene, self.bullet_cool_down, self, "reload_bullet")
+                    schedule(update.scene, self.tri_missle_cool_down, self, "reload_tri_missle")
+                if not (self.bullet_ready or self.tri_missle_ready):
+                    continue
+                towards_player = towards.freeze()
                 spawn_position = self.position + towards_player.truncate(0.5)
-                if self.bullet_cool_down <= 0:
-                    update.scene.add(
-                        Bullet(
+                if self.bullet_ready:
+                    if admitted(update.scene, values.layer_enemy_bullet):
+                        update.scene.add(Bullet(
                             position=spawn_position,
                             heading=towards_player.normalize(),
-                            target="player"
-                        )
-                    )
-                    self.bullet_cool_down = values.enemy_ace_bullet_cool_down
-                else:
-                    self.bullet_cool_down -= update.time_delta
-                if self.tri_missle_cool_down <= 0:
+                            **enemy_bullet_layers
+                        ))
+                    self.bullet_ready = False
+                    schedule(update.scene, self.bullet_cool_down, self, "reload_bullet")
+                if self.tri_missle_ready:
+                    self.launch_zero(update.scene, spawn_position, towards_player)
+                    self.tri_missle_ready = False
                     if self.tri_missle_count:
-                        update.scene.add(
-                            Zero(
-                                position=spawn_position,
-                                heading=towards_player.normalize(),
-                                size=.5
-                            )
-                        )
                         self.tri_missle_count -= 1
-                        self.tri_missle_cool_down = 0.2
+                        schedule(update.scene, 0.2, self, "reload_tri_missle")
                     else:
-                        update.scene.add(
-                            Zero(
-                                position=spawn_position,
-                                heading=towards_player.normalize(),
-                                size=.5
-                            )
-                        )
                         self.tri_missle_count = 2
-                        self.tri_missle_cool_down = values.enemy_ace_tri_missle_cool_down
-                else:
-                    self.tri_missle_cool_down -= update.time_delta
+                        schedule(update.scene, self.tri_missle_cool_down, self, "reload_tri_missle")
         else:
-            self.heading = Vector(0, -1)
+            self.heading = down
             self.speed = self.max_thrust
 
+    def reload_bullet(self, scene, signal):
+        self.bullet_ready = True
+
+    def reload_tri_missle(self, scene, signal):
+        self.tri_missle_ready = True
+
+    @staticmethod
+    def launch_zero(scene, spawn_position, towards_player):
+        if admitted(scene, values.layer_missile):
+            scene.add(Zero(
+                position=spawn_position,
+                heading=towards_player.normalize(),
+                size=.5,
+                category=values.layer_missile
+            ))
+
 
 class Player(Ship):
     position = Vector(0, -9)
@@ -340,6 +393,9 @@ class Player(Ship):
     guns = 0
     engines = 0
     health = values.player_health
+    category = values.layer_player
+    # Which player this is, in co-op.
+    peer = 0
     images = [
         [
             Image(f"shooter/resources/ship/g{g}e{e}.png")
@@ -353,30 +409,50 @@ class Player(Ship):
     def on_update(self, update: ppb_events.Update, signal):
         if self.health <= 0:
             update.scene.remove(self)
-            update.scene.add(RunOnceAnimation(
-                position=self.position,
-                life_span=0.25,
-                image=Animation("shooter/resources/explosions/player/sprite_{1..7}.png", 24),
-                end_event=shooter_events.PlayerDied(),
-                size=2
+            signal(shooter_events.SpawnEffect(
+                "player_explosion",
+                self.position,
+                end_event=shooter_events.PlayerDied()
             ))
             signal(ppb_events.PlaySound(sounds["dead"]))
 
-        controller = update.controls
-        self.heading = Vector(controller.get("horizontal"), controller.get("vertical"))
+        peer_controls = getattr(update, "peer_controls", None)
+        if peer_controls is not None:
+            # Netplay sends one input state per player each tick.
+            self.steer(peer_controls[self.peer])
+            self.move(update.time_delta)
+            return
+
+        # Inputs take effect at the point in the tick they arrived.
+        moved = 0
+        for record in getattr(update, "inputs", ()):
+            if record.name is None:
+                continue
+            self.move(update.time_delta * (record.fraction - moved))
+            moved = record.fraction
+            self.steer(record.controls)
+        self.steer(update.controls)
+        self.move(update.time_delta * (1 - moved))
+
+    def steer(self, controls):
+        self.heading = Vector(controls.get("horizontal"), controls.get("vertical"))
         if self.heading:
             self.heading = self.heading.normalize()
-        self.move(update.time_delta)
 
     def on_shoot(self, shoot_event: shooter_events.Shoot, signal):
+        if shoot_event.peer != self.peer:
+            return
         scene = shoot_event.scene
-        tags = ["bullet", "friendly"]
+        if not admitted(scene, values.layer_friendly_bullet, 2 * self.guns + 1):
+            return
         signal(ppb_events.PlaySound(sounds["player_laser"]))
         initial_x, initial_y = self.top.center
         for offset in range(2 * self.guns + 1):
-            scene.add(Bullet(position=Vector(initial_x + (-0.5 * self.guns) + (0.5 * offset), initial_y), tags=tags))
+            scene.add(Bullet(position=Vector(initial_x + (-0.5 * self.guns) + (0.5 * offset), initial_y)))
 
     def on_power_up(self, power_up_event: shooter_events.PowerUp, signal):
+        if power_up_event.player not in (None, self):
+            return
         if (power_up_event.kind == PowerUps.GUN
                 and self.guns < values.player_gun_max):
             self.guns += 1
@@ -384,8 +460,9 @@ class Player(Ship):
                 and self.engines < values.player_engine_max):
             self.engines += 1
         elif power_up_event.kind == PowerUps.SHIELD:
-            if not list(power_up_event.scene.get(tag="shield")):
-                power_up_event.scene.add(Shield(parent=self, position=self.position), tags=["player"])
+            shields = power_up_event.scene.get(layer=values.layer_shield)
+            if not any(shield.parent is self for shield in shields):
+                power_up_event.scene.add(Shield(parent=self, position=self.position))
 
     @property
     def speed(self):
@@ -397,25 +474,38 @@ class Player(Ship):
 
 
 class PowerUp(MoveMixin):
-    images = {
-        PowerUps.GUN: Animation("shooter/resources/powerup/gun/{0..7}.png", 6),
-        PowerUps.SHIELD: Animation("shooter/resources/powerup/shield/sprite_{0..7}.png", 6),
-        PowerUps.ENGINE: Animation("shooter/resources/powerup/engine/sprite_{0..7}.png", 6)
+    frames = {
+        PowerUps.GUN: [Image(f"shooter/resources/powerup/gun/{n}.png") for n in range(8)],
+        PowerUps.SHIELD: [Image(f"shooter/resources/powerup/shield/sprite_{n}.png") for n in range(8)],
+        PowerUps.ENGINE: [Image(f"shooter/resources/powerup/engine/sprite_{n}.png") for n in range(8)]
     }
+    frame_rate = 6
+    frame_time = 0
     speed = 1
     kind = PowerUps.GUN
+    mask = values.layer_player
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.image = self.images[self.kind]
+        self.image = self.frames[self.kind][0]
 
     def on_update(self, update_event: ppb_events.Update, signal):
         self.move(update_event.time_delta)
-        for p in update_event.scene.get(kind=Player):
+        # Only the spin is shed under load, never the pick up.
+        time_delta = self.throttled_time(update_event)
+        if time_delta is not None:
+            self.animate(time_delta)
+        for p in update_event.scene.get(layer=self.mask):
             if (p.position - self.position).length * 2 < p.size + self.size:
-                signal(shooter_events.PowerUp(self.kind))
+                signal(shooter_events.PowerUp(self.kind, player=p))
                 signal(ppb_events.PlaySound(sounds["power_up"]))
                 update_event.scene.remove(self)
+                return
+
+    def animate(self, time_delta):
+        frames = self.frames[self.kind]
+        self.frame_time += time_delta
+        self.image = frames[int(self.frame_time * self.frame_rate) % len(frames)]
 
 
 class Shield(DamageMixin):
@@ -424,6 +514,8 @@ class Shield(DamageMixin):
     size = 2
     impact = 1000
     health = 15
+    category = values.layer_shield
+    mask = values.layer_enemy
 
     def on_update(self, event: ppb_events.Update, signal):
         self.position = self.parent.position
@@ -431,7 +523,7 @@ class Shield(DamageMixin):
             event.scene.remove(self)
             return
         enemy: EnemyShip
-        for enemy in event.scene.get(tag="enemy"):
+        for enemy in event.scene.get(layer=self.mask):
             if self.collides_with(enemy):
                 enemy.damage(self.impact)
                 event.scene.remove(self)
@@ -1,9 +1,86 @@
+from copy import copy
+from enum import IntEnum
+from inspect import signature
+
 from ppb import BaseSprite
+from ppb.eventlib import BadEventHandlerException
+from ppb.events import Update
+
+__all__ = ["SpriteRoot", "UpdatePriority"]
+
+class UpdatePriority(IntEnum):
+    CRITICAL = 0
+    COSMETIC = 1
+
+
+class ScheduledMixin:
+    """
+    Lets `FrameBudgetScheduler` thin out updates for low priority sprites.
 
-__all__ = ["SpriteRoot"]
+    Declare `update_priority` on the class. Updates skipped under load have
+    their time carried into the next update the sprite does run. Which
+    ticks a sprite skips is set by its `update_slot`, numbered by its scene
+    in the order sprites were added unless one was given, so the same game,
+    or one restored from a snapshot, skips the same updates every run.
+    Every other event goes through ppb's own dispatch.
 
+    Sprites in an update's `updated`, set by `ParallelUpdater`, have
+    already been updated by it and skip that update.
+    """
+    update_priority = UpdatePriority.CRITICAL
+    deferred_time = 0
+    update_slot = None
 
-class SpriteRoot(BaseSprite):
+    def __event__(self, bag, fire_event):
+        if not isinstance(bag, Update):
+            super().__event__(bag, fire_event)
+            return
+        if self in getattr(bag, "updated", ()):
+            return
+        if self.update_priority:
+            time_delta = self.throttled_time(bag, self.update_priority)
+            if time_delta is None:
+                return
+            if time_delta != bag.time_delta:
+                bag = copy(bag)
+                bag.time_delta = time_delta
+        # Every sprite updates every tick, so skip ppb's per call logging.
+        handler = getattr(self, "on_update", None)
+        if handler is None:
+            return
+        try:
+            handler(bag, fire_event)
+        except TypeError as ex:
+            try:
+                signature(handler).bind(bag, fire_event)
+            except TypeError:
+                raise BadEventHandlerException(self, "on_update", bag) from ex
+            raise
+
+    def throttled_time(self, update: Update, priority=UpdatePriority.COSMETIC):
+        """
+        The time `priority` work should step by this update, with any time
+        carried over from updates shed before it, or None when it is shed
+        this update.
+        """
+        stride = getattr(update, "strides", {}).get(priority, 1)
+        if stride == 1 and not self.deferred_time:
+            return update.time_delta
+        self.deferred_time += update.time_delta
+        if getattr(update, "tick", 0) % stride != self.update_slot % stride:
+            return None
+        time_delta, self.deferred_time = self.deferred_time, 0
+        return time_delta
+
+
+class SpriteRoot(ScheduledMixin, BaseSprite):
+    """
+    `category` holds the collision layers a sprite is in and `mask` the
+    layers it hits, as bits from `values.layer_*`. Scenes index sprites by
+    category when they are added, so set it before then.
+    """
+    category = 0
+    mask = 0
 
     def collides_with(self, other: 'SpriteRoot'):
         halfs = (self.size + other.size) / 2
@@ -11,14 +88,18 @@ class SpriteRoot(BaseSprite):
                 and abs(self.center.y - other.center.y) < halfs)
 
 
-class RunOnceAnimation(BaseSprite):
-    life_span = 0.5
-    counter = 0
-    end_event = None
+def schedule(scene, delay: float, owner, name: str):
+    """
+    Call `owner.name(scene, signal)` after delay seconds of simulated time,
+    on the scene's timer wheel.
+    """
+    return scene.timers.schedule(delay, owner, name)
+
 
-    def on_update(self, event, signal):
-        self.counter += event.time_delta
-        if self.counter >= self.life_span:
-            event.scene.remove(self)
-            if self.end_event is not None:
-                signal(self.end_event)
+def admitted(scene, layer: int, count: int = 1) -> bool:
+    """
+    Ask the scene's entity budget whether count sprites in layer may be
+    spawned. Scenes without a budget admit everything.
+    """
+    budget = getattr(scene, "entity_budget", None)
+    return budget is None or budget.admit(scene, layer, count)
@@ -1,16 +1,20 @@
 from ppb import Image
-from ppb.features.animation import Animation
 
+from shooter import values
+from shooter.events import SpawnEffect
 from shooter.events import SpawnPlayer
 from shooter.sprites import SpriteRoot
-from shooter.sprites.root import RunOnceAnimation
+from shooter.sprites.root import UpdatePriority
 
 __all__ = [
     "Start"
 ]
 
 
-class Number(SpriteRoot):
+class Digit(SpriteRoot):
+    """
+    One decimal place of a number, drawn from the font images.
+    """
     numbers = [
         Image(f"shooter/resources/font/{x}.png")
         for x in range(10)
@@ -18,31 +22,40 @@ class Number(SpriteRoot):
     image = numbers[0]
     size = 0.75
     place = 0
-
-    def on_score_change(self, event, signal):
-        self.update_image(event.score)
+    shown_score = None
+    update_priority = UpdatePriority.COSMETIC
 
     def __repr__(self):
-        return f"<Number image={self.image}, place={self.place}>"
+        return f"<{type(self).__name__} image={self.image}, place={self.place}>"
 
     def update_image(self, score):
+        self.shown_score = score
         self.image = self.numbers[((score // 10 ** self.place) % 10)]
 
 
+class Number(Digit):
+    score = None
+
+    def on_score_change(self, event, signal):
+        self.score = event.score
+
+    def on_update(self, event, signal):
+        if self.score is not None and self.score != self.shown_score:
+            self.update_image(self.score)
+
+
 class LifeSymbol(SpriteRoot):
     image = Image("shooter/resources/ship/g0e0.png")
-    symbol_explodes = Animation("shooter/resources/explosions/player/sprite_{1..7}.png", 12)
     size = 0.5
+    category = values.layer_life
+    number = 0
 
-    def kill(self, scene):
-        scene.add(RunOnceAnimation(
-            position=self.position,
-            image=self.symbol_explodes,
-            end_event=SpawnPlayer()
-        ))
+    def kill(self, scene, signal):
+        signal(SpawnEffect("life_lost", self.position, end_event=SpawnPlayer()))
         scene.remove(self)
 
 
 class Start(SpriteRoot):
     image = Image("shooter/resources/start.png")
     size = 4
+    category = values.layer_button
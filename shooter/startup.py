@@ -0,0 +1,96 @@
+"""
+Start up profiler.
+
+Run with `python -m shooter.startup`. It starts the game in a fresh
+interpreter with `-X importtime` and `--startup-report`, which quits as
+soon as the gameplay systems have loaded behind the splash. It then prints
+how long each stage took from spawning the process, and the imports
+before and after the first frame by package and slowest module.
+"""
+import json
+import subprocess
+import sys
+import tempfile
+from argparse import ArgumentParser
+from collections import defaultdict
+from pathlib import Path
+from time import monotonic
+from typing import NamedTuple
+
+stages = (
+    ("imports_finished", "interpreter and imports"),
+    ("systems_started", "systems started"),
+    ("first_frame", "first frame"),
+    ("systems_loaded", "gameplay systems loaded"),
+)
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_time: float
+    cumulative: float
+
+
+def parse_import_times(output: str):
+    """
+    Read the `-X importtime` lines of `output`, times in seconds.
+    """
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_time, cumulative, module = line[len("import time:"):].split("|")
+        if not self_time.strip().isdigit():
+            continue  # The column header.
+        yield ImportTime(module.strip(), int(self_time) / 1e6, int(cumulative) / 1e6)
+
+
+def print_imports(title, imports, top):
+    total = sum(i.self_time for i in imports)
+    print(f"\n{title}: {total * 1e3:.1f} ms in {len(imports)} modules")
+    packages = defaultdict(float)
+    for i in imports:
+        packages[i.module.partition(".")[0]] += i.self_time
+    for package, time in sorted(packages.items(), key=lambda p: -p[1])[:top]:
+        print(f"  {time * 1e3:9.1f} ms  {package}")
+    print("  slowest modules, self and cumulative:")
+    for i in sorted(imports, key=lambda i: -i.self_time)[:top]:
+        print(f"  {i.self_time * 1e3:9.1f} ms {i.cumulative * 1e3:9.1f} ms  {i.module}")
+
+
+parser = ArgumentParser(prog="python -m shooter.startup")
+parser.add_argument("--top", type=int, default=10,
+                    help="Packages and modules to list per phase.")
+
+
+def main(argv=None):
+    args = parser.parse_args(argv)
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "startup.json"
+        spawned = monotonic()
+        child = subprocess.run(
+            [sys.executable, "-X", "importtime", "-m", "shooter",
+             "--startup-report", str(path)],
+            stderr=subprocess.PIPE, text=True
+        )
+        if child.returncode or not path.exists():
+            sys.stderr.write(child.stderr)
+            sys.exit(child.returncode or 1)
+        report = json.loads(path.read_text())
+
+    print(f"{'stage':30} {'from spawn':>12} {'step':>10}")
+    previous = spawned
+    for mark, label in stages:
+        at = report["marks"][mark]
+        print(f"{label:30} {(at - spawned) * 1e3:9.1f} ms {(at - previous) * 1e3:7.1f} ms")
+        previous = at
+
+    early = set(report["first_frame_modules"])
+    imports = list(parse_import_times(child.stderr))
+    print_imports("Imported before the first frame",
+                  [i for i in imports if i.module in early], args.top)
+    print_imports("Imported after the first frame",
+                  [i for i in imports if i.module not in early], args.top)
+
+
+if __name__ == "__main__":
+    main()
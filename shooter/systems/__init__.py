@@ -1,5 +1,19 @@
-from shooter.systems.controller import *
-from shooter.systems.enemy import *
-from shooter.systems.life_counter import *
-from shooter.systems.powerups import *
-from shooter.systems.scoring import *
+"""
+Game systems.
+
+Submodules are imported on first attribute access, so importing this
+package does not pull in the gameplay sprites and their images until a
+system that needs them is used.
+"""
+from shooter.lazy import lazy_exports
+
+modules, __getattr__, __dir__ = lazy_exports(__name__, __path__)
+
+__all__ = [*modules, "find_system"]
+
+
+def find_system(engine, kind: type):
+    """
+    The engine's first system that is an instance of `kind`, or None.
+    """
+    return next((system for system in engine.systems if isinstance(system, kind)), None)
@@ -0,0 +1,71 @@
+from typing import Iterable
+from typing import NamedTuple
+
+from ppb import events as ppb_events
+from ppb.systemslib import System
+
+from shooter import values
+
+__all__ = [
+    "Quota",
+    "EntityBudget",
+]
+
+
+class Quota(NamedTuple):
+    layer: int
+    limit: int
+    priority: int = 0
+
+
+default_quotas: Iterable[Quota] = (
+    Quota(values.layer_enemy, values.budget_enemy_limit, 0),
+    Quota(values.layer_friendly_bullet, values.budget_friendly_limit, 0),
+    Quota(values.layer_enemy_bullet, values.budget_enemy_bullet_limit, 1),
+    Quota(values.layer_missile, values.budget_missile_limit, 2),
+    Quota(values.layer_beacon, values.budget_beacon_limit, 3),
+)
+
+
+class EntityBudget(System):
+    """
+    Admission control for spawners.
+
+    Quotas are per collision layer, so live counts come straight from the
+    scene's layer index and removals need no bookkeeping. A spawn is
+    refused when its layer is at its quota, or when every budgeted layer
+    together would pass its ceiling. A layer of priority p may fill the
+    total limit less p times `priority_headroom`, so priority 0, the most
+    important, keeps the headroom above the less important layers free.
+
+    The budget attaches itself to scenes as `entity_budget`, spawners ask
+    it through `shooter.sprites.root.admitted`.
+    """
+
+    def __init__(self, *, quotas: Iterable[Quota] = None,
+                 total_limit: int = values.budget_total_limit,
+                 priority_headroom: int = values.budget_priority_headroom,
+                 **kwargs):
+        if quotas is None:
+            quotas = default_quotas
+        super().__init__(**kwargs)
+        self.quotas = {quota.layer: quota for quota in quotas}
+        self.total_limit = total_limit
+        self.priority_headroom = priority_headroom
+
+    def on_scene_started(self, started: ppb_events.SceneStarted, signal):
+        started.scene.entity_budget = self
+
+    def on_scene_continued(self, continued: ppb_events.SceneContinued, signal):
+        continued.scene.entity_budget = self
+
+    def admit(self, scene, layer: int, count: int = 1) -> bool:
+        quota = self.quotas.get(layer)
+        if quota is None:
+            return True
+        layers = scene.layers
+        if len(layers[layer]) + count > quota.limit:
+            return False
+        total = sum(len(layers[budgeted]) for budgeted in self.quotas)
+        ceiling = self.total_limit - quota.priority * self.priority_headroom
+        return total + count <= ceiling
@@ -0,0 +1,73 @@
+from time import monotonic
+
+from ppb import GameEngine
+from ppb import events
+from ppb.systemslib import System
+
+from shooter import values
+
+__all__ = [
+    "FixedStepUpdater"
+]
+
+
+class FixedStepUpdater(System):
+    """
+    Drives the simulation at a fixed tick, decoupled from rendering.
+
+    Replaces ppb's `Updater` in `GameEngine`'s basic_systems. It must be
+    listed before the renderer so the ticks for an idle cycle are queued
+    ahead of that cycle's `Render`.
+
+    When the game falls behind, up to `max_catch_up` ticks run per idle
+    cycle and any further backlog is dropped. Every sprite's position is
+    stored as `previous_position` before each tick, and the fraction of a
+    tick left over is attached to `Render` events as `interpolation` so the
+    renderer can draw between the last two simulated states.
+
+    Each `Update` carries `tick_end`, the `time.monotonic()` at which its
+    tick's simulated time ran out, so inputs can be placed within it.
+    """
+
+    def __init__(self, *, engine: GameEngine,
+                 simulation_rate: int = values.simulation_rate,
+                 max_catch_up: int = values.simulation_max_catch_up,
+                 **kwargs):
+        super().__init__(**kwargs)
+        self.time_step = 1 / simulation_rate
+        self.max_catch_up = max_catch_up
+        self.accumulated_time = 0
+        self.interpolation = 0
+        self.tick_end = monotonic()
+        engine.register(events.Update, self.store_previous_positions)
+        engine.register(events.Render, self.extend_render)
+
+    def on_idle(self, idle_event: events.Idle, signal):
+        now = monotonic()
+        self.accumulated_time += idle_event.time_delta
+        steps = 0
+        while (self.accumulated_time >= self.time_step
+               and steps < self.max_catch_up):
+            self.accumulated_time -= self.time_step
+            self.tick_end = now - self.accumulated_time
+            self.step(signal)
+            steps += 1
+        if self.accumulated_time >= self.time_step:
+            # Too far behind to catch up, slow the game rather than spiral.
+            self.accumulated_time %= self.time_step
+        self.interpolation = self.accumulated_time / self.time_step
+
+    def step(self, signal):
+        update = events.Update(self.time_step)
+        update.tick_end = self.tick_end
+        signal(update)
+
+    @staticmethod
+    def store_previous_positions(update_event: events.Update):
+        if update_event.scene is None:
+            return
+        for game_object in update_event.scene:
+            game_object.previous_position = game_object.position
+
+    def extend_render(self, render_event: events.Render):
+        render_event.interpolation = self.interpolation
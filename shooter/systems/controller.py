@@ -1,4 +1,7 @@
+from collections import deque
+from time import monotonic
 from typing import Iterable
+from typing import Mapping
 from typing import NamedTuple
 from typing import Union
 
@@ -8,10 +11,14 @@ from ppb import events
 from ppb import keycodes as key
 from ppb.systemslib import System
 
+from shooter import values
+
 __all__ = [
     "Axis",
     "Switch",
     "Impulse",
+    "Controls",
+    "InputRecord",
     "ControllerSystem"
 ]
 
@@ -37,6 +44,48 @@ SoftwareInputs = Union[Axis, Switch, Impulse]
 PhysicalInputs = Union[buttons.MouseButton, key.KeyCode]
 
 
+class Controls(Mapping):
+    """
+    An immutable snapshot of control values.
+
+    The version increases every time an input changes a value, so a
+    snapshot can be shared across frames and compared cheaply.
+    """
+    __slots__ = ("__values", "version")
+
+    def __init__(self, control_values: dict, version: int):
+        self.__values = dict(control_values)
+        self.version = version
+
+    def __getitem__(self, name):
+        return self.__values[name]
+
+    def __iter__(self):
+        return iter(self.__values)
+
+    def __len__(self):
+        return len(self.__values)
+
+    def __repr__(self):
+        return f"<Controls version={self.version} {self.__values}>"
+
+
+class InputRecord(NamedTuple):
+    """
+    A timestamped activation of an Axis, Switch or Impulse.
+
+    time is `time.monotonic()` when the input arrived. fraction is where
+    that falls within the simulated tick of the update that received it, 0
+    at its start and 1 at its end. For Impulses name is None and value is
+    the event type.
+    """
+    time: float
+    name: str
+    value: Union[int, type]
+    controls: Controls
+    fraction: float = 1
+
+
 class ControllerSystem(System):
     """
     A controller subsystem for translating inputs into events or single
@@ -53,9 +102,19 @@ class ControllerSystem(System):
 
     To access controls:
 
-    In your on_update handlers, look for a controls dict, using the names
-    defined in your config objects. Impulses do not have associated values,
-    they emit the event you declared.
+    In your on_update handlers, look for a controls mapping, using the
+    names defined in your config objects. Impulses do not have associated
+    values, they emit the event you declared. The mapping is a `Controls`
+    snapshot, the same object is reused until an input changes.
+
+    Update events also carry `inputs`, the `InputRecord`s that arrived
+    during the update's tick, in order, so handlers can apply them at the
+    point in the tick they happened. Ticks are placed by the `tick_end`
+    `FixedStepUpdater` puts on updates, so updates run back to back to
+    catch up each get the inputs of their own stretch of time, and
+    `controls` are as they stood at the end of it. Without a `tick_end`
+    every waiting input takes effect at the start of the update. Recent
+    records are kept in `input_buffer`.
     """
 
     def __init__(self, *, engine: GameEngine,
@@ -80,8 +139,13 @@ class ControllerSystem(System):
         self.__values = {}
         self.__inputs = {}
         self.__key_config = key_config or {}
+        self.__version = 0
+        self.__snapshot = None
+        self.__pending = []
+        self.__buffer = deque(maxlen=values.input_buffer_length)
         for i in inputs:
             self.add(i)
+        self.__tick_controls = self.controls
         engine.register(events.Update, self.extend_update)
 
     def add(self, _input: SoftwareInputs):
@@ -115,8 +179,45 @@ class ControllerSystem(System):
         key_value = self.__key_config.get(switch.name, switch.default)
         self.__inputs[key_value] = switch.name, 1
 
+    @property
+    def controls(self) -> Controls:
+        if self.__snapshot is None:
+            self.__snapshot = Controls(self.__values, self.__version)
+        return self.__snapshot
+
+    @property
+    def input_buffer(self) -> tuple:
+        return tuple(self.__buffer)
+
     def extend_update(self, update_event: events.Update):
-        update_event.controls = self.__values.copy()
+        tick_end = getattr(update_event, "tick_end", None)
+        time_step = update_event.time_delta
+        inputs = []
+        waiting = []
+        for record in self.__pending:
+            if tick_end is None:
+                fraction = 0
+            elif record.time > tick_end:
+                waiting.append(record)
+                continue
+            else:
+                fraction = 1 - (tick_end - record.time) / time_step if time_step else 1
+            inputs.append(record._replace(fraction=min(max(fraction, 0), 1)))
+        self.__pending = waiting
+        if not waiting:
+            self.__tick_controls = self.controls
+        elif inputs:
+            self.__tick_controls = inputs[-1].controls
+        update_event.controls = self.__tick_controls
+        update_event.inputs = tuple(inputs)
+
+    def record(self, name, value):
+        if name is not None:
+            self.__version += 1
+            self.__snapshot = None
+        record = InputRecord(monotonic(), name, value, self.controls)
+        self.__pending.append(record)
+        self.__buffer.append(record)
 
     def handle_input_activated(self, input_value: PhysicalInputs,
                                signal_function, position=None):
@@ -124,12 +225,14 @@ class ControllerSystem(System):
         value: Union[int, type]
         name, value = self.__inputs.get(input_value, (None, None))
         if name is None and value is not None:
+            self.record(name, value)
             if isinstance(input_value, buttons.MouseButton):
                 signal_function(value(position))
             else:
                 signal_function(value())
         elif name is not None:
             self.__values[name] += value
+            self.record(name, value)
 
     def handle_input_deactivated(self, input_value: PhysicalInputs):
         name: str
@@ -137,6 +240,7 @@ class ControllerSystem(System):
         name, value = self.__inputs.get(input_value, (None, None))
         if name is not None:
             self.__values[name] -= value
+            self.record(name, -value)
 
     def on_key_pressed(self, key_event: events.KeyPressed, signal):
         self.handle_input_activated(key_event.key, signal)
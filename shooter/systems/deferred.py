@@ -0,0 +1,47 @@
+from typing import Sequence
+
+from ppb import GameEngine
+from ppb import events as ppb_events
+from ppb.systemslib import System
+
+from shooter import systems
+from shooter.events import SystemsLoaded
+
+__all__ = [
+    "DeferredSystems",
+]
+
+
+class DeferredSystems(System):
+    """
+    Starts systems once the first frame is on screen.
+
+    The gameplay systems import every sprite module, and with them every
+    image, which would hold up the splash on a cold start. This system
+    takes their names in `shooter.systems` and waits for the first `Idle`
+    after a `Render`. It then imports, constructs and enters them with the
+    engine's keyword arguments, appends them to `engine.systems` in order
+    and signals `SystemsLoaded`.
+    """
+
+    def __init__(self, *, engine: GameEngine, deferred_systems: Sequence[str] = (),
+                 **kwargs):
+        super().__init__(**kwargs)
+        self.engine = engine
+        self.names = list(deferred_systems)
+        self.rendered = False
+        self.loaded = False
+
+    def on_render(self, render: ppb_events.Render, signal):
+        self.rendered = True
+
+    def on_idle(self, idle: ppb_events.Idle, signal):
+        if self.loaded or not self.rendered:
+            return
+        self.loaded = True
+        engine = self.engine
+        for name in self.names:
+            system = getattr(systems, name)(engine=engine, **engine.kwargs)
+            engine.systems.append(system)
+            engine.exit_stack.enter_context(system)
+        signal(SystemsLoaded())
@@ -0,0 +1,100 @@
+from typing import NamedTuple
+from typing import Sequence
+
+from ppb import GameEngine
+from ppb import Image
+from ppb import events as ppb_events
+from ppb.systemslib import System
+
+from shooter import events as shooter_events
+
+__all__ = [
+    "Effects"
+]
+
+
+class EffectAnimation(NamedTuple):
+    frames: Sequence[Image]
+    frames_per_second: float
+    life_span: float
+    size: float = 1
+
+
+def frames(pattern: str, first: int, last: int):
+    return [Image(pattern.format(n)) for n in range(first, last + 1)]
+
+
+player_explosion = frames("shooter/resources/explosions/player/sprite_{}.png", 1, 7)
+
+
+effect_animations = {
+    "player_explosion": EffectAnimation(player_explosion, 24, 0.25, 2),
+    "life_lost": EffectAnimation(player_explosion, 12, 0.5, 0.5),
+    "enemy_explosion": EffectAnimation(player_explosion, 24, 0.3, 1.5),
+}
+
+
+class Effects(System):
+    """
+    Runs every short lived visual effect from one list.
+
+    Effects are tuples of (scene, start time, animation id, position,
+    end event), started with a `SpawnEffect` event and advanced in a single
+    pass per `Update`. A finished effect signals its end event, if it has
+    one. The active effects are added to `Render.effects`, which the
+    renderer draws.
+    """
+
+    def __init__(self, *, engine: GameEngine, animations: dict = None,
+                 **kwargs):
+        if animations is None:
+            animations = effect_animations
+        super().__init__(**kwargs)
+        self.animations = animations
+        self.effects = []
+        self.clock = 0
+        engine.register(ppb_events.Render, self.extend_render)
+
+    def on_spawn_effect(self, spawn: shooter_events.SpawnEffect, signal):
+        self.effects.append(
+            (spawn.scene, self.clock, spawn.effect, spawn.position, spawn.end_event)
+        )
+
+    def on_enemy_killed(self, killed: shooter_events.EnemyKilled, signal):
+        self.effects.append(
+            (killed.scene, self.clock, "enemy_explosion", killed.enemy.position, None)
+        )
+
+    def on_update(self, update: ppb_events.Update, signal):
+        self.clock += update.time_delta
+        active = []
+        for effect in self.effects:
+            scene, start, animation_id, _, end_event = effect
+            if (scene is update.scene
+                    and self.clock - start >= self.animations[animation_id].life_span):
+                if end_event is not None:
+                    signal(end_event)
+            else:
+                active.append(effect)
+        self.effects = active
+
+    def on_scene_stopped(self, stopped: ppb_events.SceneStopped, signal):
+        self.effects = [e for e in self.effects if e[0] is not stopped.scene]
+
+    def extend_render(self, render_event: ppb_events.Render):
+        render_event.effects = [*getattr(render_event, "effects", ()),
+                                *self.active(render_event.scene)]
+
+    def active(self, scene):
+        """The (image, position, size) of every effect showing in scene."""
+        return [
+            self.frame(start, animation_id, position)
+            for effect_scene, start, animation_id, position, _ in self.effects
+            if effect_scene is scene
+        ]
+
+    def frame(self, start, animation_id, position):
+        animation = self.animations[animation_id]
+        index = int((self.clock - start) * animation.frames_per_second)
+        image = animation.frames[min(index, len(animation.frames) - 1)]
+        return image, position, animation.size
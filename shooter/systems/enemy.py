@@ -10,7 +10,9 @@ from ppb import events as ppb_events
 from ppb.systemslib import System
 
 from shooter import events as s_events
+from shooter import values
 from shooter.sprites import gameplay as game_sprites
+from shooter.sprites.root import admitted
 
 
 __all__ = [
@@ -197,6 +199,8 @@ class EndlessStrategy(NoStrategy):
         if not formations:
             return
         formation = choice(formations)
+        if not admitted(scene, values.layer_enemy, len(formation.ships)):
+            return
         span = formation.spread
         modifiers = formation.offsets
         ships = formation.ships
@@ -204,7 +208,7 @@ class EndlessStrategy(NoStrategy):
         spawn_x = min_x + (rand() * (10 - span))
         origin = Vector(spawn_x, 10)
         for modifier, ship in zip(modifiers, ships):
-            scene.add(enemy_types[ship](position=origin + modifier), tags=["enemy", "ship"])
+            scene.add(enemy_types[ship](position=origin + modifier))
 
     def calculate_next_spawn(self):
         self.next_spawn_time += 0.75
@@ -225,14 +229,21 @@ class EnemyLoader(System):
     """
     Spawns enemies based on either an input file or an algorithmic
     "endless" mode.
+
+    Spawn timing and danger advance with each `Update`, so they keep pace
+    with the simulation whatever the frame rate.
     """
-    strategy = NoStrategy(())
 
     def __init__(self, *, formations=None, **kwargs):
         if formations is None:
             formations = default_formations
         super().__init__(formations=formations, **kwargs)
         self.formations = list(formations)
+        self.strategy = NoStrategy(self.formations)
+
+    @property
+    def danger(self):
+        return getattr(self.strategy, "danger", 0)
 
     def on_scene_started(self, started: ppb_events.SceneStarted, signal):
         self.manage_strategy(started.scene)
@@ -241,13 +252,13 @@ class EnemyLoader(System):
         self.manage_strategy(continued.scene)
 
     def manage_strategy(self, scene):
-        strategy = getattr(scene, "spawn_strategy", Strategies.NONE).value
+        strategy = Strategies[getattr(scene, "spawn_strategy", "NONE")].value
         self.strategy = strategy(self.formations)
 
-    def on_idle(self, idle: ppb_events.Idle, signal):
-        self.strategy.advance(idle.time_delta, idle.scene)
+    def on_update(self, update: ppb_events.Update, signal):
+        self.strategy.advance(update.time_delta, update.scene)
         if self.strategy.paused:
-            available_enemies = list(idle.scene.get(tag="enemy"))
+            available_enemies = list(update.scene.get(layer=values.layer_enemy))
             if not available_enemies:
                 self.strategy.unpause()
                 signal(s_events.EnemiesClear())
@@ -262,7 +273,8 @@ class EnemyLoader(System):
 class EnemyComms(System):
 
     def on_enemy_killed(self, killed: s_events.EnemyKilled, signal):
-        if isinstance(killed.enemy, game_sprites.CargoShip):
+        if (isinstance(killed.enemy, game_sprites.CargoShip)
+                and admitted(killed.scene, values.layer_beacon)):
             killed.scene.add(game_sprites.Beacon(position=killed.enemy.position))
 
     def on_enemy_alerted(self, alert: s_events.EnemyAlerted, signal):
@@ -0,0 +1,127 @@
+import json
+from time import monotonic
+from typing import NamedTuple
+
+from ppb import GameEngine
+from ppb import events
+from ppb.systemslib import System
+
+from shooter import values
+from shooter.sprites import gameplay as game_sprites
+
+__all__ = [
+    "InputLatency"
+]
+
+
+class LatencySample(NamedTuple):
+    name: str
+    queued: float
+    simulated: float
+    rendered: float
+
+    @property
+    def total(self):
+        return self.queued + self.simulated + self.rendered
+
+
+def percentile(ordered, fraction):
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+class InputLatency(System):
+    """
+    Measures input to photon latency in three stages.
+
+    An input is timestamped by the `ControllerSystem` when it arrives. It
+    is followed to the end of the first `Update` after which the `Player`
+    heading has changed, or for Impulses, new friendly bullets exist. It
+    then waits for the next rendered frame to finish.
+
+    queued: input arrival to the start of that update.
+    simulated: that update, start to finish.
+    rendered: end of that update to the frame being presented.
+
+    Samples are written as JSON to `latency_report` on exit.
+    """
+
+    def __init__(self, *, engine: GameEngine, latency_report: str = None,
+                 **kwargs):
+        super().__init__(**kwargs)
+        self.report_path = latency_report
+        self.samples = []
+        self.awaiting = []
+        self.simulated = []
+        self.update_start = None
+        self.update_scene = None
+        self.heading = None
+        self.bullets = set()
+        self.frame_pending = False
+        engine.register(..., self.observe)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.report_path:
+            with open(self.report_path, "w") as report:
+                json.dump(self.report(), report, indent=2)
+
+    def observe(self, event):
+        now = monotonic()
+        if self.frame_pending:
+            self.frame_presented(now)
+        if self.update_start is not None:
+            self.update_finished(now)
+        if isinstance(event, events.Update) and event.scene is not None:
+            self.update_started(now, event)
+        elif isinstance(event, events.Render):
+            self.frame_pending = True
+
+    def update_started(self, now, update):
+        self.update_start = now
+        self.update_scene = update.scene
+        for record in getattr(update, "inputs", ()):
+            self.awaiting.append((record, now))
+
+    def update_finished(self, now):
+        scene = self.update_scene
+        player = next(scene.get(kind=game_sprites.Player), None)
+        heading = None if player is None else player.heading
+        bullets = set(scene.layers[values.layer_friendly_bullet])
+        turned = heading != self.heading
+        fired = bool(bullets - self.bullets)
+        still_waiting = []
+        for record, start in self.awaiting:
+            if fired if record.name is None else turned:
+                self.simulated.append((record, start, now))
+            elif now - record.time < values.latency_timeout:
+                still_waiting.append((record, start))
+        self.awaiting = still_waiting
+        self.heading = heading
+        self.bullets = bullets
+        self.update_start = None
+        self.update_scene = None
+
+    def frame_presented(self, now):
+        for record, start, end in self.simulated:
+            name = record.name or record.value.__name__
+            self.samples.append(
+                LatencySample(name, start - record.time, end - start, now - end)
+            )
+        self.simulated = []
+        self.frame_pending = False
+
+    def report(self):
+        summary = {}
+        for stage in ("queued", "simulated", "rendered", "total"):
+            ordered = sorted(getattr(sample, stage) for sample in self.samples)
+            if not ordered:
+                continue
+            summary[stage] = {
+                "p50": percentile(ordered, 0.5),
+                "p90": percentile(ordered, 0.9),
+                "p99": percentile(ordered, 0.99),
+                "max": ordered[-1],
+            }
+        return {
+            "summary": summary,
+            "samples": [sample._asdict() for sample in self.samples],
+        }
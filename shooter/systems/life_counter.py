@@ -17,28 +17,47 @@ __all__ = [
 
 
 class LifeCounter(System):
-    lives = values.player_starting_lives
-    player_spawn_request = False
-    enemies_clear = False
+    """
+    Keeps the lives the players share.
 
-    @staticmethod
-    def spawn_player(scene):
-        player = game_sprites.Player()
-        scene.add(player, tags=["ship", "player"])
+    `players` is how many `Player` ships there are, one per peer in co-op.
+    Any player dying costs a life, and the players missing are spawned
+    again once the enemies have cleared.
+    """
+
+    def __init__(self, *, players: int = 1, **kwargs):
+        super().__init__(**kwargs)
+        self.players = players
+        self.lives = values.player_starting_lives
+        self.player_spawn_request = False
+        self.enemies_clear = False
+
+    def spawn_player(self, scene):
+        present = {player.peer for player in scene.get(kind=game_sprites.Player)}
+        for peer in range(self.players):
+            if peer in present:
+                continue
+            offset = (peer - (self.players - 1) / 2) * values.coop_spawn_spacing
+            scene.add(game_sprites.Player(
+                peer=peer,
+                position=game_sprites.Player.position + Vector(offset, 0),
+            ))
 
     def on_player_died(self, died, signal):
-        next(died.scene.get(tag=f"life_{self.lives}")).kill(died.scene)
+        for life in died.scene.get(layer=values.layer_life):
+            if life.number == self.lives:
+                life.kill(died.scene, signal)
 
     def on_set_lives(self, command: SetLives, signal):
         """Signalled by a game load, resets lives and spawns a player."""
         self.lives = values.player_starting_lives
-        for life in command.scene.get(tag="life_ui"):
+        for life in command.scene.get(layer=values.layer_life):
             command.scene.remove(life)
         for i in range(1, self.lives + 1):
-            command.scene.add(
-                ui.LifeSymbol(position=Vector(-4.5 + ((i - 1) * ui.LifeSymbol.size * 2), 9.5)),
-                tags=["life_ui", f"life_{i}"]
-            )
+            command.scene.add(ui.LifeSymbol(
+                position=Vector(-4.5 + ((i - 1) * ui.LifeSymbol.size * 2), 9.5),
+                number=i
+            ))
         self.spawn_player(command.scene)
 
     def on_spawn_player(self, spawn: SpawnPlayer, signal):
@@ -0,0 +1,166 @@
+import socket
+from collections import Counter
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from threading import Event
+from threading import Thread
+from time import monotonic
+
+from ppb import GameEngine
+from ppb import events as ppb_events
+from ppb.systemslib import System
+
+from shooter import events as shooter_events
+from shooter import values
+from shooter.systems import find_system
+from shooter.systems.enemy import EnemyLoader
+from shooter.systems.life_counter import LifeCounter
+from shooter.systems.scoring import ScoringSystem
+
+__all__ = [
+    "Metrics",
+]
+
+
+class Metrics(System):
+    """
+    Live counters and gauges for dashboards.
+
+    Counters are kept up to date from `Update`, `Render`, `EnemyKilled`,
+    `EnemyEscaped` and `PlayerDied`. Bullets spawned are the bullets in the
+    bullet layers that were not there the update before. Gauges, like
+    sprites per class, lives and danger, are read from the scene and
+    systems only when collected, so an idle exporter costs nothing.
+
+    With `metrics_port` set, a background thread serves them in the
+    Prometheus text format at `http://127.0.0.1:<port>/metrics`. With
+    `statsd` set to `host:port`, another pushes them as statsd UDP packets
+    every `push_interval` seconds.
+    """
+
+    def __init__(self, *, engine: GameEngine, metrics_port: int = None,
+                 statsd: str = None,
+                 push_interval: float = values.metrics_push_interval, **kwargs):
+        super().__init__(**kwargs)
+        self.engine = engine
+        self.port = metrics_port
+        self.statsd = statsd
+        self.push_interval = push_interval
+        self.counters = Counter()
+        self.frame_time = 0
+        self.last_frame = None
+        self.bullets = set()
+        self.server = None
+        self.threads = []
+        self.stopped = Event()
+
+    def __enter__(self):
+        if self.port is not None:
+            self.server = ThreadingHTTPServer(("127.0.0.1", self.port), self.request_handler())
+            self.threads.append(Thread(target=self.server.serve_forever,
+                                       name="metrics server", daemon=True))
+        if self.statsd is not None:
+            self.threads.append(Thread(target=self.push, name="statsd", daemon=True))
+        for thread in self.threads:
+            thread.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stopped.set()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+        for thread in self.threads:
+            thread.join()
+
+    def on_update(self, update: ppb_events.Update, signal):
+        self.counters["updates"] += 1
+        if update.scene is None:
+            return
+        layers = update.scene.layers
+        bullets = layers[values.layer_friendly_bullet].keys() | layers[values.layer_enemy_bullet].keys()
+        self.counters["bullets_spawned"] += len(bullets - self.bullets)
+        self.bullets = bullets
+
+    def on_render(self, render: ppb_events.Render, signal):
+        now = monotonic()
+        if self.last_frame is not None:
+            self.frame_time = now - self.last_frame
+        self.last_frame = now
+        self.counters["frames"] += 1
+
+    def on_enemy_killed(self, killed: shooter_events.EnemyKilled, signal):
+        self.counters["enemies_killed"] += 1
+
+    def on_enemy_escaped(self, escaped: shooter_events.EnemyEscaped, signal):
+        self.counters["enemies_escaped"] += 1
+
+    def on_player_died(self, died: shooter_events.PlayerDied, signal):
+        self.counters["player_deaths"] += 1
+
+    def gauges(self) -> dict:
+        """
+        Gauges by name, with per class sprite counts under "sprites".
+        """
+        scene = self.engine.current_scene
+        loader = find_system(self.engine, EnemyLoader)
+        lives = find_system(self.engine, LifeCounter)
+        scoring = find_system(self.engine, ScoringSystem)
+        return {
+            "frame_time_seconds": self.frame_time,
+            "danger": loader.danger if loader else 0,
+            "lives": lives.lives if lives else 0,
+            "score": scoring.score if scoring else 0,
+            "sprites": Counter(type(s).__name__ for s in scene or ()),
+        }
+
+    def prometheus(self) -> str:
+        lines = []
+        for name, value in sorted(self.counters.items()):
+            lines += [f"# TYPE shooter_{name}_total counter",
+                      f"shooter_{name}_total {value}"]
+        gauges = self.gauges()
+        sprites = gauges.pop("sprites")
+        for name, value in gauges.items():
+            lines += [f"# TYPE shooter_{name} gauge", f"shooter_{name} {value}"]
+        lines.append("# TYPE shooter_sprites gauge")
+        lines += [f'shooter_sprites{{kind="{kind}"}} {count}'
+                  for kind, count in sorted(sprites.items())]
+        return "\n".join(lines) + "\n"
+
+    def request_handler(self):
+        metrics = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return MetricsHandler
+
+    def push(self):
+        host, port = self.statsd.rsplit(":", 1)
+        address = (host, int(port))
+        sent = Counter()
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            while not self.stopped.wait(self.push_interval):
+                counters = Counter(self.counters)
+                lines = [f"shooter.{name}:{value - sent[name]}|c"
+                         for name, value in sorted(counters.items())]
+                sent = counters
+                gauges = self.gauges()
+                sprites = gauges.pop("sprites")
+                lines += [f"shooter.{name}:{value}|g" for name, value in gauges.items()]
+                lines += [f"shooter.sprites.{kind}:{count}|g"
+                          for kind, count in sorted(sprites.items())]
+                sock.sendto("\n".join(lines).encode(), address)
@@ -0,0 +1,71 @@
+from ppb import GameEngine
+from ppb import events
+
+from shooter import values
+from shooter.netplay import RollbackSession
+from shooter.netplay import UdpTransport
+from shooter.systems import find_system
+from shooter.systems.clocks import FixedStepUpdater
+from shooter.systems.controller import ControllerSystem
+
+__all__ = [
+    "Netplay"
+]
+
+
+class Netplay(FixedStepUpdater):
+    """
+    Plays co-op as one peer of a `RollbackSession` over UDP.
+
+    Replaces `FixedStepUpdater` in `GameEngine`'s basic_systems, with a
+    `ControllerSystem` among the systems. Each tick the controller's axes,
+    and whether it fired since the last tick, go to the session instead of
+    an `Update` being signalled. `Render` events draw the session's scene
+    and effects in place of the engine's own scene, which stays empty.
+
+    `coop` is the other peer as `host:port`. Both peers need the same
+    `coop_seed` and a different `coop_peer`, 0 or 1. The engine quits when
+    the co-op game is over.
+    """
+
+    def __init__(self, *, engine: GameEngine, coop: str,
+                 coop_port: int = values.netplay_port, coop_peer: int = 0,
+                 coop_seed: int = 0, **kwargs):
+        super().__init__(engine=engine, **kwargs)
+        self.engine = engine
+        self.coop = coop
+        self.coop_port = coop_port
+        self.coop_peer = coop_peer
+        self.coop_seed = coop_seed
+        self.session = None
+        self.controller = None
+        self.fire = False
+
+    def __enter__(self):
+        host, port = self.coop.rsplit(":", 1)
+        transport = UdpTransport(("0.0.0.0", self.coop_port), (host, int(port)))
+        self.session = RollbackSession(self.coop_peer, transport,
+                                       seed=self.coop_seed, time_step=self.time_step)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.session.close()
+
+    def on_shoot(self, shoot, signal):
+        self.fire = True
+
+    def step(self, signal):
+        if self.controller is None:
+            self.controller = find_system(self.engine, ControllerSystem)
+        controls = self.controller.controls
+        if self.session.advance(controls["horizontal"], controls["vertical"], self.fire):
+            self.fire = False
+        if self.session.finished:
+            signal(events.Quit())
+
+    def extend_render(self, render_event: events.Render):
+        super().extend_render(render_event)
+        scene = self.session.scene
+        if scene is not None:
+            render_event.scene = scene
+            render_event.effects = [*getattr(render_event, "effects", ()),
+                                    *self.session.effects.active(scene)]
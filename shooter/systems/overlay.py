@@ -0,0 +1,129 @@
+from time import monotonic
+
+from ppb import GameEngine
+from ppb import Vector
+from ppb import events as ppb_events
+from ppb import keycodes
+from ppb.systemslib import System
+
+from shooter import values
+from shooter.scene import Game
+from shooter.sprites import ui
+from shooter.systems import find_system
+from shooter.systems.enemy import EnemyLoader
+
+__all__ = [
+    "PerfOverlay",
+]
+
+
+class PerfOverlay(System):
+    """
+    A performance readout in the top left corner of the `Game` scene.
+
+    `toggle_key`, F3 by default, shows and hides it. It is drawn with the
+    score's font as six rows of three digits, from the top:
+
+    frames per second,
+    simulation ms per frame, in tenths,
+    render ms per frame, in tenths,
+    live sprites,
+    live bullets, friendly and enemy,
+    the enemy strategy's danger.
+
+    The digits are not sprites. They are added to `Render.effects`, so
+    the renderer draws them over the scene and the scene, and snapshots of
+    it, never hold them.
+
+    An event extension charges the time from the start of one event's
+    dispatch to the start of the next to the first, so `Update` and
+    `Render` time includes every handler. Times are averaged over
+    `refresh` seconds and the digits only change then, so the overlay's own
+    cost stays out of what it shows. Hidden, it only checks a flag.
+    """
+    rows = 6
+    columns = 3
+
+    def __init__(self, *, engine: GameEngine, toggle_key=keycodes.F3,
+                 refresh: float = values.perf_overlay_refresh, **kwargs):
+        super().__init__(**kwargs)
+        self.engine = engine
+        self.toggle_key = toggle_key
+        self.refresh = refresh
+        self.shown = False
+        left, top = values.perf_overlay_top_left
+        size = values.perf_overlay_digit_size
+        self.cells = [
+            [(place, Vector(left + column * size, top - row * size * 1.25))
+             for column, place in enumerate(range(self.columns - 1, -1, -1))]
+            for row in range(self.rows)
+        ]
+        self.drawn = []
+        self.current = None
+        self.reset()
+        engine.register(..., self.observe)
+        engine.register(ppb_events.Render, self.extend_render)
+
+    def reset(self):
+        self.window_start = None
+        self.frames = 0
+        self.simulation = 0
+        self.rendering = 0
+
+    def observe(self, event):
+        if not self.shown:
+            return
+        now = monotonic()
+        if self.current is not None:
+            event_type, start = self.current
+            if event_type is ppb_events.Update:
+                self.simulation += now - start
+            elif event_type is ppb_events.Render:
+                self.rendering += now - start
+        self.current = type(event), now
+
+    def on_key_pressed(self, key_pressed: ppb_events.KeyPressed, signal):
+        if key_pressed.key == self.toggle_key:
+            self.shown = not self.shown
+            self.current = None
+            self.drawn = []
+            self.reset()
+
+    def on_render(self, render: ppb_events.Render, signal):
+        if not self.shown or not isinstance(render.scene, Game):
+            return
+        scene = render.scene
+        now = monotonic()
+        if self.window_start is None:
+            self.window_start = now
+            return
+        self.frames += 1
+        elapsed = now - self.window_start
+        if elapsed < self.refresh:
+            return
+        layers = scene.layers
+        readings = (
+            self.frames / elapsed,
+            self.simulation / self.frames * 10000,
+            self.rendering / self.frames * 10000,
+            len(scene.game_objects),
+            len(layers[values.layer_friendly_bullet]) + len(layers[values.layer_enemy_bullet]),
+            self.danger(),
+        )
+        size = values.perf_overlay_digit_size
+        self.drawn = []
+        for row, reading in zip(self.cells, readings):
+            reading = min(round(reading), 10 ** self.columns - 1)
+            for place, position in row:
+                image = ui.Digit.numbers[(reading // 10 ** place) % 10]
+                self.drawn.append((image, position, size))
+        self.reset()
+        self.window_start = now
+
+    def extend_render(self, render_event: ppb_events.Render):
+        if self.shown and isinstance(render_event.scene, Game):
+            render_event.effects = [*getattr(render_event, "effects", ()), *self.drawn]
+
+    def danger(self) -> float:
+        loader = find_system(self.engine, EnemyLoader)
+        return loader.danger if loader else 0
@@ -0,0 +1,185 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy
+from functools import partial
+
+from ppb import GameEngine
+from ppb import events as ppb_events
+from ppb.systemslib import System
+
+from shooter import values
+from shooter.scene import layer_bits
+from shooter.sprites import gameplay as game_sprites
+from shooter.sprites.root import admitted
+from shooter.timers import Timer
+
+__all__ = [
+    "ParallelUpdater",
+]
+
+
+# Escorts steer by their cargo ship, which can be in any band.
+serial_kinds = (game_sprites.EscortFrigate,)
+parallel_kinds = (game_sprites.Bullet, game_sprites.EnemyShip, game_sprites.PowerUp)
+
+
+def free_threaded() -> bool:
+    """
+    Whether this interpreter runs Python threads without the GIL.
+    """
+    gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return gil_enabled is not None and not gil_enabled()
+
+
+class BandTimers:
+    """
+    A band's stand in for the scene's `TimerWheel`. Timers are started
+    on the wheel when the band is merged.
+    """
+
+    def __init__(self, band: 'Band'):
+        self.band = band
+
+    def schedule(self, delay: float, owner, name: str) -> Timer:
+        timer = Timer(0, 0, owner, name)
+        self.band.log.append((self.band.scene.timers.start, timer, delay))
+        return timer
+
+
+class Band:
+    """
+    The scene as the sprites of one band see it during an update.
+
+    Reads go to the scene, which nothing changes until every band of the
+    phase is done. Adds, removes, timers and signals are logged instead,
+    and `merge` applies them to the scene in the order they were made.
+    Each add asks the scene's entity budget again as it is applied, and is
+    dropped if refused, so bands together stay within its quotas.
+    """
+
+    def __init__(self, scene, signal):
+        self.scene = scene
+        self.emit = signal
+        self.timers = BandTimers(self)
+        self.log = []
+        self.added = []
+
+    def __getattr__(self, name):
+        return getattr(self.scene, name)
+
+    def __contains__(self, game_object):
+        return game_object in self.scene
+
+    def __iter__(self):
+        return iter(self.scene)
+
+    def add(self, game_object, tags=()):
+        self.log.append((self.enter, game_object, tags))
+
+    def enter(self, game_object, tags):
+        # Spawns were admitted against the counts from before the phase, and
+        # other bands may have spawned since, so they are admitted again.
+        for layer in layer_bits(getattr(game_object, "category", 0)):
+            if not admitted(self.scene, layer):
+                return
+        self.scene.add(game_object, tags)
+        self.added.append(game_object)
+
+    def remove(self, game_object):
+        self.log.append((self.discard, game_object))
+
+    def discard(self, game_object):
+        # An enemy killed as it escapes removes itself twice.
+        if game_object in self.scene:
+            self.scene.remove(game_object)
+
+    def signal(self, event):
+        self.log.append((self.emit, event))
+
+    def merge(self):
+        for action, *args in self.log:
+            action(*args)
+
+
+class ParallelUpdater(System):
+    """
+    Updates bullets, enemy ships and power ups across a thread pool on
+    free-threaded builds of Python.
+
+    The playfield is split into `parallel_bands` horizontal bands and each
+    sprite goes to the band its center is in. Once the scene's timers have
+    turned, the even bands are updated at the same time, one per worker,
+    then the odd bands. Bands are taller than any two sprites can reach,
+    so sprites updated at the same time never touch the same sprite. Each
+    band sees the scene through a `Band`, and after each half the bands
+    are merged in order from the bottom, which makes the result the same
+    however the workers were scheduled. Every other sprite, and anything
+    spawned by a band, is then updated as usual.
+
+    With the GIL the threads would only take turns, so unless
+    `parallel_threads` is set the system does nothing and every sprite
+    updates serially.
+    """
+
+    def __init__(self, *, engine: GameEngine,
+                 parallel_bands: int = values.parallel_bands,
+                 parallel_threads: bool = None, **kwargs):
+        super().__init__(**kwargs)
+        self.band_count = parallel_bands
+        self.band_height = values.game_height / parallel_bands
+        self.bottom = -values.game_height / 2
+        self.threaded = free_threaded() if parallel_threads is None else parallel_threads
+        self.pool = None
+        if self.threaded:
+            engine.register(ppb_events.Update, self.extend_update)
+
+    def __enter__(self):
+        if self.threaded:
+            self.pool = ThreadPoolExecutor((self.band_count + 1) // 2,
+                                           thread_name_prefix="band")
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+    def extend_update(self, update_event: ppb_events.Update):
+        update_event.parallel = self
+
+    def partition(self, scene):
+        bands = [[] for _ in range(self.band_count)]
+        last = self.band_count - 1
+        for kind in parallel_kinds:
+            for sprite in scene.get(kind=kind):
+                if isinstance(sprite, serial_kinds):
+                    continue
+                index = int((sprite.position.y - self.bottom) // self.band_height)
+                bands[min(max(index, 0), last)].append(sprite)
+        return bands
+
+    def update_bands(self, scene, update: ppb_events.Update, signal):
+        """
+        Update the sprites in every band, then mark them, and those they
+        added, as updated for the rest of `update`.
+        """
+        bands = self.partition(scene)
+        updated = {}
+        for phase in (bands[0::2], bands[1::2]):
+            update_band = partial(self.update_band, scene=scene, update=update, signal=signal)
+            # Nothing is merged until the whole phase is done.
+            for band in list(self.pool.map(update_band, phase)):
+                band.merge()
+                updated.update(dict.fromkeys(band.added))
+        for sprites in bands:
+            updated.update(dict.fromkeys(sprites))
+        update.updated = updated
+
+    @staticmethod
+    def update_band(sprites, scene, update: ppb_events.Update, signal) -> Band:
+        band = Band(scene, signal)
+        band_update = copy(update)
+        band_update.scene = band
+        band_update.parallel = None
+        band_update.updated = ()
+        for sprite in sprites:
+            sprite.__event__(band_update, band.signal)
+        return band
@@ -0,0 +1,132 @@
+import multiprocessing
+from math import isnan
+from multiprocessing import shared_memory
+
+from ppb import GameEngine
+from ppb import events as ppb_events
+from ppb.systemslib import System
+
+from shooter import planning
+from shooter import values
+from shooter.sprites import gameplay as game_sprites
+
+__all__ = [
+    "AIPlanner",
+]
+
+
+kinds = {
+    game_sprites.Ace: planning.ACE,
+    game_sprites.Zero: planning.ZERO,
+    game_sprites.EscortFrigate: planning.ESCORT,
+}
+
+
+class AIPlanner(System):
+    """
+    Moves `Ace` steering, `Zero` intercepts and `EscortFrigate` volley
+    targets to a worker process.
+
+    At the start of each `Update` the plans for the snapshot sent the
+    update before are set as `plan` on their sprites, then a new snapshot
+    is written to the shared block and the worker woken. A plan is only
+    ever used for the one update after its snapshot. When the worker has
+    not answered in time, no plans are set that update, no new snapshot is
+    sent, and the sprites decide inline as they always have.
+
+    See `shooter.planning` for the worker and the block layout.
+    """
+
+    def __init__(self, *, engine: GameEngine,
+                 max_enemies: int = values.planner_max_enemies, **kwargs):
+        super().__init__(**kwargs)
+        self.max_enemies = max_enemies
+        self.records, self.plans = planning.layout(max_enemies)
+        self.memory = None
+        self.block = None
+        self.wake = None
+        self.worker = None
+        self.request = 0
+        self.submitted = []
+        self.planned = []
+        self.late = 0
+        engine.register(ppb_events.Update, self.exchange)
+
+    def __enter__(self):
+        self.memory = shared_memory.SharedMemory(
+            create=True, size=planning.block_size(self.max_enemies)
+        )
+        self.block = self.memory.buf.cast("d")
+        context = multiprocessing.get_context("spawn")
+        self.wake = context.Semaphore(0)
+        self.worker = context.Process(
+            target=planning.serve,
+            args=(self.memory.name, self.max_enemies, self.wake),
+            name="ai planner",
+            daemon=True,
+        )
+        self.worker.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.block[planning.REQUEST] = planning.STOP
+        self.wake.release()
+        self.worker.join(values.planner_shutdown_timeout)
+        if self.worker.is_alive():
+            self.worker.terminate()
+        self.block.release()
+        self.memory.close()
+        self.memory.unlink()
+
+    def exchange(self, update: ppb_events.Update):
+        if update.scene is None:
+            return
+        for sprite in self.planned:
+            sprite.plan = None
+        self.planned = []
+        if self.submitted:
+            if self.block[planning.RESULT] != self.request:
+                self.late += 1
+                return
+            self.collect()
+        self.submit(update.scene)
+
+    def collect(self):
+        block = self.block
+        for index, (sprite, kind) in enumerate(self.submitted):
+            start = self.plans + index * planning.plan_size
+            plan = tuple(block[start:start + planning.plan_lengths[kind]])
+            if not isnan(plan[0]):
+                sprite.plan = plan
+                self.planned.append(sprite)
+        self.submitted = []
+
+    def submit(self, scene):
+        players = scene.layers[values.layer_player]
+        if len(players) != 1:
+            return
+        player, = players
+        block = self.block
+        block[planning.PLAYER] = player.position.x
+        block[planning.PLAYER + 1] = player.position.y
+        block[planning.PLAYER + 2] = player.heading.x
+        block[planning.PLAYER + 3] = player.heading.y
+        block[planning.PLAYER + 4] = player.speed
+        submitted = self.submitted
+        start = self.records
+        for sprite in scene.get(layer=values.layer_enemy | values.layer_missile):
+            kind = kinds.get(type(sprite))
+            if kind is None:
+                continue
+            block[start] = kind
+            block[start + 1] = sprite.position.x
+            block[start + 2] = sprite.position.y
+            start += planning.record_size
+            submitted.append((sprite, kind))
+            if len(submitted) == self.max_enemies:
+                break
+        if not submitted:
+            return
+        block[planning.COUNT] = len(submitted)
+        self.request += 1
+        block[planning.REQUEST] = self.request
+        self.wake.release()
@@ -14,10 +14,14 @@ class PowerUp(System):
     max_time_between_powerups = 40
     minimum_time_between_powerups = 10
     max_change_between_powerups = 6
-    next_powerup = 10
+    first_powerup = 10
     choice_function = choice
     randint_function = randint
-    count = 0
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.next_powerup = self.first_powerup
+        self.count = 0
 
     def on_enemy_killed(self, killed, signal):
         self.count += killed.enemy.upgrade_points
@@ -0,0 +1,107 @@
+import os
+import signal
+import sys
+from collections import Counter
+from threading import Event
+from threading import Thread
+from threading import main_thread
+
+from ppb import GameEngine
+from ppb.systemslib import System
+
+from shooter import values
+
+__all__ = [
+    "SamplingProfiler",
+]
+
+
+def short_path(filename: str) -> str:
+    for root in sorted(sys.path, key=len, reverse=True):
+        if root and filename.startswith(root + os.sep):
+            return filename[len(root) + 1:]
+    return filename
+
+
+class SamplingProfiler(System):
+    """
+    A statistical profiler cheap enough to leave on while playing.
+
+    Every `profile_interval` seconds of CPU time a `SIGPROF` timer
+    interrupts the main thread and the handler records its stack. Where
+    there is no `setitimer`, a background thread reads the main thread's
+    stack from `sys._current_frames` instead. That only gets a look when
+    the main thread lets go of the GIL, so it over counts the main loop's
+    `sleep(0)`.
+
+    Stacks are counted by their code objects, and turned into names only
+    once on exit, when they are written to `profile` in the collapsed
+    format flamegraph tools read: one `root;caller;callee count` line per
+    stack. Each stack starts with the name of the scene running when it
+    was sampled, so `Splash`, `Menu` and `Game` show up as separate towers.
+    """
+
+    def __init__(self, *, engine: GameEngine, profile: str = None,
+                 profile_interval: float = values.profile_interval, **kwargs):
+        super().__init__(**kwargs)
+        self.engine = engine
+        self.path = profile
+        self.interval = profile_interval
+        self.samples = Counter()
+        self.labels = {}
+        self.stopped = Event()
+        self.thread = None
+        self.previous_handler = None
+
+    def __enter__(self):
+        if self.path is None:
+            return
+        if hasattr(signal, "setitimer"):
+            self.previous_handler = signal.signal(signal.SIGPROF, self.on_signal)
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        else:
+            self.thread = Thread(target=self.sample_thread, args=(main_thread().ident,),
+                                 name="sampling profiler", daemon=True)
+            self.thread.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.path is None:
+            return
+        if self.thread is None:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, self.previous_handler)
+        else:
+            self.stopped.set()
+            self.thread.join()
+        with open(self.path, "w") as file:
+            for line, count in self.collapsed():
+                file.write(f"{line} {count}\n")
+
+    def on_signal(self, signum, frame):
+        self.record(frame)
+
+    def sample_thread(self, thread_id: int):
+        while not self.stopped.wait(self.interval):
+            self.record(sys._current_frames().get(thread_id))
+
+    def record(self, frame):
+        stack = []
+        while frame is not None:
+            stack.append(frame.f_code)
+            frame = frame.f_back
+        scene = self.engine.current_scene
+        self.samples[type(scene).__name__ if scene is not None else "None", tuple(stack)] += 1
+
+    def label(self, code) -> str:
+        label = self.labels.get(code)
+        if label is None:
+            name = getattr(code, "co_qualname", code.co_name)
+            path = short_path(code.co_filename)
+            label = self.labels[code] = f"{path}:{name}".replace(";", ":")
+        return label
+
+    def collapsed(self):
+        lines = Counter()
+        for (scene, stack), count in self.samples.items():
+            lines[";".join([scene, *(self.label(code) for code in reversed(stack))])] += count
+        return sorted(lines.items())
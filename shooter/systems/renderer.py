@@ -0,0 +1,237 @@
+from collections import defaultdict
+from itertools import groupby
+
+import pygame
+
+from ppb import Image
+from ppb import events
+from ppb import flags
+from ppb import vfs
+from ppb.systems import Renderer
+
+from shooter import values
+
+__all__ = [
+    "InterpolatingRenderer",
+    "HeadlessRenderer",
+]
+
+
+def layer_of(game_object):
+    return getattr(game_object, "layer", 0)
+
+
+class InterpolatingRenderer(Renderer):
+    """
+    A batching renderer that draws sprites between their last two simulated
+    positions.
+
+    Pair with `FixedStepUpdater`, which supplies `previous_position` on
+    sprites and `interpolation` on `Render` events. Sprites without a
+    previous position are drawn where they are.
+
+    Within a layer, sprites sharing an image, size and rotation (every
+    `Bullet`, the `ui.Number` digits) are batched: the surface is scaled and
+    rotated once per batch and the whole frame goes to the window as one
+    blit list.
+
+    Effects attached to `Render` events as (image, position, size) tuples
+    are drawn above the sprites.
+    """
+    interpolation = 1
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.rotated_images = {}
+        self.old_rotated_images = {}
+
+    def on_render(self, render_event: events.Render, signal):
+        self.interpolation = getattr(render_event, "interpolation", 1)
+        self.draw(render_event.scene, getattr(render_event, "effects", ()))
+        pygame.display.update()
+
+    def draw(self, scene, effects=()):
+        self.render_background(scene)
+
+        self.old_resized_images = self.resized_images
+        self.resized_images = {}
+        self.old_rotated_images = self.rotated_images
+        self.rotated_images = {}
+
+        frame = self.frame(scene.main_camera)
+        blit_list = []
+        for _, layer in groupby(scene.sprite_layers(), key=layer_of):
+            for resource, game_objects in self.batches(layer):
+                self.extend_blit_list(blit_list, resource, game_objects, frame)
+        for image, position, size in effects:
+            resource = self.resize_image(self.load_image(image), size)
+            self.extend_blit_list(blit_list, resource, [position], frame)
+        self.window.blits(blit_list, False)
+
+    def frame(self, camera):
+        """The left and top edges of the view, and pixels per game unit."""
+        return camera.frame_left, camera.frame_top, camera.pixel_ratio
+
+    def load_image(self, image):
+        return image.load()
+
+    def batches(self, game_objects):
+        batches = defaultdict(list)
+        for game_object in game_objects:
+            if game_object.size <= 0:
+                continue
+            image = game_object.__image__()
+            if image is flags.DoNotRender:
+                continue
+            batches[image, game_object.size, game_object.rotation].append(game_object)
+        for (image, size, rotation), batch in batches.items():
+            yield self.prepare_batch_resource(image, size, rotation), batch
+
+    def prepare_batch_resource(self, image, size, rotation):
+        if isinstance(image, str):
+            image = Image(image)
+        resized_image = self.resize_image(self.load_image(image), size)
+        if not rotation:
+            return resized_image
+        key = (resized_image, rotation)
+        rotated_image = self.old_rotated_images.get(key)
+        if rotated_image is None:
+            rotated_image = self.rotate_image(resized_image, rotation)
+        self.rotated_images[key] = rotated_image
+        return rotated_image
+
+    def extend_blit_list(self, blit_list, resource, game_objects, frame):
+        # Plain float math, this runs for every sprite every frame.
+        left, top, ratio = frame
+        alpha = self.interpolation
+        get_rect = resource.get_rect
+        for game_object in game_objects:
+            # Effects are drawn at bare positions.
+            x, y = getattr(game_object, "position", game_object)
+            previous = getattr(game_object, "previous_position", None)
+            if previous is not None:
+                previous_x, previous_y = previous
+                x = previous_x + (x - previous_x) * alpha
+                y = previous_y + (y - previous_y) * alpha
+            blit_list.append((
+                resource,
+                get_rect(center=((x - left) * ratio, (top - y) * ratio))
+            ))
+
+
+class HeadlessRenderer(InterpolatingRenderer):
+    """
+    Draws into an offscreen buffer instead of a window.
+
+    The buffer is `values.resolution` scaled by `scale`. `pixels` is a
+    NumPy array of shape (height, width, 3) that views the buffer's memory,
+    so reading it after a render costs no copy. It is rewritten in place
+    every render.
+
+    In symbolic mode no pixels are drawn. `symbols` is a (game_height,
+    game_width) array of `grid_pixel_size` cells, each holding the code
+    from `symbol_code` of a sprite in that cell, 0 for empty.
+
+    Images load straight from disk so no window or asset loader is needed.
+    Can replace `InterpolatingRenderer` in basic_systems, or be driven
+    directly with `draw` or `draw_symbols`.
+    """
+
+    def __init__(self, *, scale: float = values.framebuffer_scale,
+                 symbolic: bool = False, **kwargs):
+        import numpy
+
+        super().__init__(**kwargs)
+        width, height = values.resolution
+        self.resolution = round(width * scale), round(height * scale)
+        self.pixel_ratio = values.grid_pixel_size * scale
+        self.symbolic = symbolic
+        # The surface draws straight into this array's memory.
+        self.buffer = numpy.zeros((self.resolution[1], self.resolution[0], 4),
+                                  dtype=numpy.uint8)
+        self.window = pygame.image.frombuffer(self.buffer, self.resolution, "RGBX")
+        self.pixels = self.buffer[:, :, :3]
+        self.symbols = numpy.zeros((values.game_height, values.game_width),
+                                   dtype=numpy.uint8)
+        self.images = {}
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def pre_render_updates(self, scene):
+        pass
+
+    def on_render(self, render_event: events.Render, signal):
+        self.interpolation = getattr(render_event, "interpolation", 1)
+        if self.symbolic:
+            self.draw_symbols(render_event.scene)
+        else:
+            self.draw(render_event.scene, getattr(render_event, "effects", ()))
+
+    def frame(self, camera):
+        x, y = camera.position
+        return (x - values.game_width / 2, y + values.game_height / 2,
+                self.pixel_ratio)
+
+    def load_image(self, image):
+        surface = self.images.get(image.name)
+        if surface is None:
+            with vfs.open(image.name) as file:
+                surface = pygame.image.load(file, image.name)
+            self.images[image.name] = surface
+        return surface
+
+    def draw_symbols(self, scene):
+        symbols = self.symbols
+        symbols.fill(0)
+        left, top, _ = self.frame(scene.main_camera)
+        rows, columns = symbols.shape
+        for game_object in scene:
+            code = symbol_code(type(game_object))
+            if not code:
+                continue
+            x, y = game_object.position
+            column = int(x - left)
+            row = int(top - y)
+            if 0 <= row < rows and 0 <= column < columns:
+                symbols[row, column] = code
+        return symbols
+
+
+symbol_order = (
+    "Player",
+    "Shield",
+    "Alert",
+    "Bullet",
+    "Beacon",
+    "PatrolShip",
+    "CargoShip",
+    "EscortFrigate",
+    "Zero",
+    "Ace",
+    "PowerUp",
+)
+
+symbol_codes = {}
+
+
+def symbol_code(kind: type) -> int:
+    """
+    The symbolic mode code of a sprite class: one more than the index in
+    `symbol_order` of the first class in its MRO named there, or 0.
+
+    Classes are named rather than imported so the renderer does not pull in
+    the gameplay sprites before the splash is drawn.
+    """
+    code = symbol_codes.get(kind)
+    if code is None:
+        code = next(
+            (symbol_order.index(k.__name__) + 1 for k in kind.mro()
+             if k.__name__ in symbol_order),
+            0
+        )
+        symbol_codes[kind] = code
+    return code
@@ -0,0 +1,64 @@
+from ppb import GameEngine
+from ppb import events
+from ppb.systemslib import System
+
+from shooter import values
+from shooter.sprites.root import UpdatePriority
+
+__all__ = [
+    "FrameBudgetScheduler"
+]
+
+
+class FrameBudgetScheduler(System):
+    """
+    Sheds non-critical sprite updates when frames run over budget.
+
+    Watches the longest idle cycle in each window. If it went over
+    `frame_budget` the shed level rises, if it stayed under half the budget
+    the level falls. At shed level n, sprites that declare
+    `update_priority = UpdatePriority.COSMETIC` update on one of every 2 ** n
+    ticks. Critical sprites always update.
+    """
+
+    def __init__(self, *, engine: GameEngine,
+                 frame_budget: float = values.frame_budget,
+                 window: float = values.frame_budget_window,
+                 max_shed_level: int = values.frame_budget_max_shed,
+                 **kwargs):
+        super().__init__(**kwargs)
+        self.frame_budget = frame_budget
+        self.window = window
+        self.max_shed_level = max_shed_level
+        self.shed_level = 0
+        self.window_time = 0
+        self.worst_frame = 0
+        self.tick = 0
+        self.strides = self.calculate_strides()
+        engine.register(events.Update, self.extend_update)
+
+    def calculate_strides(self):
+        return {
+            priority: 2 ** (self.shed_level * priority)
+            for priority in UpdatePriority
+        }
+
+    def on_idle(self, idle_event: events.Idle, signal):
+        self.worst_frame = max(self.worst_frame, idle_event.time_delta)
+        self.window_time += idle_event.time_delta
+        if self.window_time < self.window:
+            return
+        if (self.worst_frame > self.frame_budget
+                and self.shed_level < self.max_shed_level):
+            self.shed_level += 1
+            self.strides = self.calculate_strides()
+        elif self.worst_frame < self.frame_budget / 2 and self.shed_level:
+            self.shed_level -= 1
+            self.strides = self.calculate_strides()
+        self.window_time = 0
+        self.worst_frame = 0
+
+    def extend_update(self, update_event: events.Update):
+        self.tick += 1
+        update_event.tick = self.tick
+        update_event.strides = self.strides
@@ -11,9 +11,12 @@ __all__ = ["ScoringSystem"]
 
 
 class ScoringSystem(System):
-    high_score = 0
-    score = 0
-    last_score = 0
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.high_score = 0
+        self.score = 0
+        self.last_score = 0
 
     @staticmethod
     def generate_score_board(scene, start_position, score):
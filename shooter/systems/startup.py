@@ -0,0 +1,51 @@
+import json
+import sys
+from time import monotonic
+
+from ppb import events as ppb_events
+from ppb.systemslib import System
+
+from shooter.events import SystemsLoaded
+
+__all__ = [
+    "StartupReport",
+]
+
+
+class StartupReport(System):
+    """
+    Times a start up, then quits.
+
+    Marks are `time.monotonic` readings: `imports_finished` is passed in
+    by `shooter.__main__`, `systems_started` is taken when this system is
+    entered, `first_frame` once the first `Render` has been drawn and
+    `systems_loaded` on `SystemsLoaded`. They are written as JSON to
+    `startup_report` with the modules imported before the first frame.
+    List it after the renderer so its render handler runs after the
+    display update.
+
+    `python -m shooter.startup` runs the game with this report and adds an
+    import time breakdown.
+    """
+
+    def __init__(self, *, startup_report: str = None, imports_finished: float = None,
+                 **kwargs):
+        super().__init__(**kwargs)
+        self.path = startup_report
+        self.marks = {"imports_finished": imports_finished}
+        self.first_frame_modules = None
+
+    def __enter__(self):
+        self.marks["systems_started"] = monotonic()
+
+    def on_render(self, render: ppb_events.Render, signal):
+        if self.first_frame_modules is None:
+            self.marks["first_frame"] = monotonic()
+            self.first_frame_modules = sorted(sys.modules)
+
+    def on_systems_loaded(self, loaded: SystemsLoaded, signal):
+        self.marks["systems_loaded"] = monotonic()
+        with open(self.path, "w") as file:
+            json.dump({"marks": self.marks,
+                       "first_frame_modules": self.first_frame_modules}, file)
+        signal(ppb_events.Quit())
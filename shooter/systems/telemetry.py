@@ -0,0 +1,176 @@
+import json
+import struct
+import sys
+from array import array
+from queue import Queue
+from threading import Thread
+from time import monotonic
+from typing import Dict
+
+from ppb import GameEngine
+from ppb import events as ppb_events
+from ppb.systemslib import System
+
+from shooter import values
+from shooter.sprites import gameplay as game_sprites
+from shooter.systems import find_system
+from shooter.systems.enemy import EnemyLoader
+from shooter.systems.life_counter import LifeCounter
+from shooter.systems.scoring import ScoringSystem
+
+__all__ = [
+    "Telemetry",
+    "read_telemetry",
+]
+
+
+MAGIC = b"SHOOTER TELEMETRY 1\n"
+chunk_header = struct.Struct("<I")
+
+counted_kinds = (
+    game_sprites.Player,
+    game_sprites.Bullet,
+    game_sprites.Alert,
+    game_sprites.Beacon,
+    game_sprites.PatrolShip,
+    game_sprites.CargoShip,
+    game_sprites.EscortFrigate,
+    game_sprites.Zero,
+    game_sprites.Ace,
+    game_sprites.PowerUp,
+    game_sprites.Shield,
+)
+
+columns = (
+    ("time", "d"),
+    ("frame_time", "d"),
+    ("danger", "d"),
+    ("score", "q"),
+    ("lives", "q"),
+    ("bullets_fired", "q"),
+    ("bullets_hit", "q"),
+    *((f"count_{kind.__name__}", "q") for kind in counted_kinds),
+)
+
+
+def read_telemetry(path: str) -> Dict[str, array]:
+    """
+    Read a telemetry file into one `array.array` per column.
+
+    The arrays support the buffer protocol, so `numpy.frombuffer` can view
+    them without copying.
+    """
+    with open(path, "rb") as file:
+        if file.readline() != MAGIC:
+            raise ValueError(f"{path} is not a telemetry file.")
+        header = json.loads(file.readline())
+        data = {name: array(typecode) for name, typecode in header["columns"]}
+        swap = header["byteorder"] != sys.byteorder
+        while True:
+            raw_count = file.read(chunk_header.size)
+            if len(raw_count) < chunk_header.size:
+                break
+            count, = chunk_header.unpack(raw_count)
+            for name, column in data.items():
+                chunk = array(column.typecode)
+                chunk.frombytes(file.read(count * chunk.itemsize))
+                if swap:
+                    chunk.byteswap()
+                column.extend(chunk)
+    return data
+
+
+class Telemetry(System):
+    """
+    Records one row of metrics per rendered frame to a columnar file.
+
+    Rows are buffered into per column arrays. Every `chunk_rows` rows the
+    arrays are handed to a background thread, which writes them as a row
+    count followed by each column's raw bytes. The file opens with a JSON
+    header naming the columns. Read it back with `read_telemetry`.
+
+    Bullets fired and hit are found by comparing friendly bullets between
+    frames: new ones were fired, and ones that left with `kill` set hit
+    something.
+    """
+
+    def __init__(self, *, engine: GameEngine, telemetry_path: str = None,
+                 chunk_rows: int = values.telemetry_chunk_rows, **kwargs):
+        super().__init__(**kwargs)
+        self.engine = engine
+        self.path = telemetry_path
+        self.chunk_rows = chunk_rows
+        self.chunks = Queue()
+        self.writer = None
+        self.buffer = self.new_buffer()
+        self.start = None
+        self.last_frame = None
+        self.friendly = set()
+
+    @staticmethod
+    def new_buffer():
+        return [array(typecode) for _, typecode in columns]
+
+    def __enter__(self):
+        if self.path is None:
+            return
+        self.writer = Thread(target=self.write, name="telemetry", daemon=True)
+        self.writer.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.writer is None:
+            return
+        self.flush()
+        self.chunks.put(None)
+        self.writer.join()
+
+    def write(self):
+        with open(self.path, "wb") as file:
+            file.write(MAGIC)
+            header = {"columns": columns, "byteorder": sys.byteorder}
+            file.write(json.dumps(header).encode() + b"\n")
+            while True:
+                chunk = self.chunks.get()
+                if chunk is None:
+                    return
+                file.write(chunk_header.pack(len(chunk[0])))
+                for column in chunk:
+                    file.write(column.tobytes())
+                file.flush()
+
+    def flush(self):
+        if self.buffer[0]:
+            self.chunks.put(self.buffer)
+            self.buffer = self.new_buffer()
+
+    def on_render(self, render: ppb_events.Render, signal):
+        if self.writer is None or render.scene is None:
+            return
+        now = monotonic()
+        if self.start is None:
+            self.start = self.last_frame = now
+        scene = render.scene
+        loader = find_system(self.engine, EnemyLoader)
+        scoring = find_system(self.engine, ScoringSystem)
+        lives = find_system(self.engine, LifeCounter)
+
+        friendly = set(scene.layers[values.layer_friendly_bullet])
+        fired = len(friendly - self.friendly)
+        hit = sum(1 for bullet in self.friendly - friendly if bullet.kill)
+        self.friendly = friendly
+
+        row = (
+            now - self.start,
+            now - self.last_frame,
+            loader.danger if loader else 0,
+            scoring.score if scoring else 0,
+            lives.lives if lives else 0,
+            fired,
+            hit,
+            *(len(scene.kinds[kind]) for kind in counted_kinds),
+        )
+        for column, value in zip(self.buffer, row):
+            column.append(value)
+        self.last_frame = now
+        if len(self.buffer[0]) >= self.chunk_rows:
+            self.flush()
@@ -0,0 +1,134 @@
+import json
+from collections import deque
+from itertools import chain
+from itertools import count
+from time import perf_counter
+
+from ppb import GameEngine
+from ppb.eventlib import camel_to_snake
+from ppb.systemslib import System
+
+from shooter import values
+
+__all__ = [
+    "EventTracer",
+]
+
+
+def microseconds() -> float:
+    return perf_counter() * 1e6
+
+
+class EventTracer(System):
+    """
+    Records every event dispatch as a Chrome trace.
+
+    Replaces the engine's `publish` with one that dispatches in the same
+    order as ppb's, timing each event and, nested inside it, each handler
+    that runs for it: event extensions, the engine, systems, the scene and
+    the sprites. Sprites are still dispatched in scene order, and each run
+    of neighbouring sprites of one class is a single span with a count.
+    Events signalled from inside a handler are linked to their own
+    dispatch with a flow arrow, so cascades like `EnemyKilled` to a beacon
+    to `PowerUp` to `ScoreChange` can be followed on the timeline.
+
+    Written to `trace` on exit as trace event JSON for chrome://tracing or
+    Perfetto. Only the last `max_spans` spans are kept, so a long session
+    writes its final stretch.
+    """
+
+    def __init__(self, *, engine: GameEngine, trace: str = None,
+                 max_spans: int = values.trace_max_spans, **kwargs):
+        super().__init__(**kwargs)
+        self.engine = engine
+        self.path = trace
+        self.max_spans = max_spans
+        self.records = deque(maxlen=max_spans)
+        self.handlers = {}
+        self.flows = {}
+        self.flow_ids = count(1)
+        if trace is not None:
+            engine.publish = self.publish
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.path is None:
+            return
+        del self.engine.publish
+        with open(self.path, "w") as file:
+            json.dump({"traceEvents": list(self.trace_events()),
+                       "displayTimeUnit": "ms"}, file)
+
+    def handler_name(self, event_type: type) -> str:
+        name = self.handlers.get(event_type)
+        if name is None:
+            name = self.handlers[event_type] = "on_" + camel_to_snake(event_type.__name__)
+        return name
+
+    def span(self, name: str, category: str, start: float, args: dict = None):
+        self.records.append(("X", name, category, start, microseconds() - start, args))
+
+    def signal(self, event):
+        flow = next(self.flow_ids)
+        self.flows[id(event)] = flow
+        self.records.append(("s", type(event).__name__, "cascade", microseconds(), flow, None))
+        self.engine.signal(event)
+
+    def publish(self):
+        engine = self.engine
+        signal = self.signal
+        event = engine.events.popleft()
+        scene = engine.current_scene
+        event.scene = scene
+        event_type = type(event)
+        handler = self.handler_name(event_type)
+        event_start = microseconds()
+        flow = self.flows.pop(id(event), None)
+        if flow is not None:
+            self.records.append(("f", event_type.__name__, "cascade", event_start, flow, None))
+
+        for callback in chain(engine.event_extensions[event_type], engine.event_extensions[...]):
+            start = microseconds()
+            callback(event)
+            self.span(getattr(callback, "__qualname__", repr(callback)), "extension", start)
+        self.dispatch(engine, event, handler, "engine")
+        for system in engine.systems:
+            self.dispatch(system, event, handler, "system")
+        if scene is not None:
+            self.dispatch(scene, event, handler, "scene")
+            kind = None
+            start = 0
+            run = 0
+            for game_object in scene:
+                if type(game_object) is not kind:
+                    self.sprite_span(kind, handler, start, run)
+                    kind = type(game_object)
+                    start = microseconds()
+                    run = 0
+                game_object.__event__(event, signal)
+                run += 1
+            self.sprite_span(kind, handler, start, run)
+        self.span(event_type.__name__, "event", event_start)
+
+    def sprite_span(self, kind: type, handler: str, start: float, run: int):
+        if kind is not None and hasattr(kind, handler):
+            self.span(f"{kind.__name__}.{handler}", "sprite", start, {"count": run})
+
+    def dispatch(self, handler_object, event, handler: str, category: str):
+        start = microseconds()
+        handler_object.__event__(event, self.signal)
+        if hasattr(handler_object, handler):
+            self.span(f"{type(handler_object).__name__}.{handler}", category, start)
+
+    def trace_events(self):
+        for phase, name, category, start, value, args in self.records:
+            record = {"name": name, "cat": category, "ph": phase, "ts": start,
+                      "pid": 1, "tid": 1}
+            if phase == "X":
+                record["dur"] = value
+                if args:
+                    record["args"] = args
+            else:
+                record["id"] = value
+                if phase == "f":
+                    record["bp"] = "e"
+            yield record
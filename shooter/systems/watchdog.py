@@ -0,0 +1,127 @@
+import json
+import sys
+import traceback
+from collections import Counter
+from threading import Event
+from threading import Thread
+from threading import get_ident
+from time import monotonic
+from time import time
+
+from ppb import GameEngine
+from ppb import events as ppb_events
+from ppb.systemslib import System
+
+from shooter import values
+from shooter.systems import find_system
+from shooter.systems.enemy import EnemyLoader
+
+__all__ = [
+    "HitchWatchdog",
+]
+
+
+class Hitch:
+
+    def __init__(self, cycle: int, scene, danger):
+        self.cycle = cycle
+        self.wall_time = time()
+        self.elapsed = 0
+        self.scene = type(scene).__name__ if scene is not None else None
+        self.danger = danger
+        self.sprites = Counter(type(sprite).__name__ for sprite in scene or ())
+        self.stacks = []
+
+    def as_dict(self) -> dict:
+        return {
+            "wall_time": self.wall_time,
+            "elapsed": self.elapsed,
+            "scene": self.scene,
+            "danger": self.danger,
+            "sprites": dict(self.sprites.most_common()),
+            "stacks": self.stacks,
+        }
+
+
+class HitchWatchdog(System):
+    """
+    Catches long frames in the act.
+
+    Every `Idle` starts a new cycle of the main loop. A background thread
+    checks every `poll_interval` how long the current cycle has run. Once
+    it passes `hitch_threshold`, the thread grabs the main thread's stack
+    from `sys._current_frames`, the scene's sprite counts per class and the
+    enemy strategy's danger. While the cycle is still stuck it adds another
+    stack each poll, up to `max_stacks`. When the cycle ends the hitch is
+    appended to `hitch_report` as one JSON line, with the longest time seen.
+    """
+
+    def __init__(self, *, engine: GameEngine, hitch_report: str = None,
+                 hitch_threshold: float = values.hitch_threshold,
+                 poll_interval: float = values.hitch_poll_interval,
+                 max_stacks: int = values.hitch_max_stacks, **kwargs):
+        super().__init__(**kwargs)
+        self.engine = engine
+        self.path = hitch_report
+        self.threshold = hitch_threshold
+        self.poll_interval = poll_interval
+        self.max_stacks = max_stacks
+        # (cycle number, start time), swapped in one assignment for the watcher.
+        self.current = (0, None)
+        self.main_thread = None
+        self.stopped = Event()
+        self.thread = None
+        self.file = None
+        engine.register(ppb_events.Idle, self.heartbeat)
+
+    def __enter__(self):
+        if self.path is None:
+            return
+        self.file = open(self.path, "a")
+        self.thread = Thread(target=self.watch, name="hitch watchdog", daemon=True)
+        self.thread.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.thread is None:
+            return
+        self.stopped.set()
+        self.thread.join()
+        self.file.close()
+
+    def heartbeat(self, idle: ppb_events.Idle):
+        self.main_thread = get_ident()
+        self.current = (self.current[0] + 1, monotonic())
+
+    def watch(self):
+        hitch = None
+        while not self.stopped.wait(self.poll_interval):
+            cycle, started = self.current
+            if hitch is not None and hitch.cycle != cycle:
+                self.write(hitch)
+                hitch = None
+            if started is None:
+                continue
+            elapsed = monotonic() - started
+            if elapsed < self.threshold:
+                continue
+            if hitch is None:
+                hitch = Hitch(cycle, self.engine.current_scene, self.danger())
+            if len(hitch.stacks) < self.max_stacks:
+                hitch.stacks.append(self.main_stack())
+            hitch.elapsed = elapsed
+        if hitch is not None:
+            self.write(hitch)
+
+    def main_stack(self) -> list:
+        frame = sys._current_frames().get(self.main_thread)
+        if frame is None:
+            return []
+        return traceback.format_stack(frame)
+
+    def danger(self):
+        loader = find_system(self.engine, EnemyLoader)
+        return loader.danger if loader else None
+
+    def write(self, hitch: Hitch):
+        self.file.write(json.dumps(hitch.as_dict()) + "\n")
+        self.file.flush()
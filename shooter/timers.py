@@ -0,0 +1,152 @@
+"""
+A hierarchical timer wheel for simulated time.
+
+Sprites that wait, for a cooldown or to expire, schedule a call on their
+scene's wheel instead of counting down every update. The wheel turns
+once per simulation tick and only looks at the timers due that tick, so
+waiting costs nothing until the wait is over.
+
+Level 0 has one slot per tick for the next `slots` ticks. Each level up
+covers `slots` times the span of the one below, and when the ticks pass
+into one of its slots the timers there are moved down to the level that
+now fits them. A timer is placed at the lowest level where its due tick
+and the current tick share every higher digit, so it is moved down only
+as often as it needs to be.
+
+Timers are a due tick, the order they were scheduled in, an owner and the
+name of the owner's method to call, so snapshots can store them like any
+other sprite attribute.
+"""
+from itertools import count
+from math import ceil
+
+from shooter import values
+
+__all__ = [
+    "Timer",
+    "TimerWheel",
+]
+
+
+class Timer:
+    __slots__ = ("due", "sequence", "owner", "name", "cancelled")
+
+    def __init__(self, due: int, sequence: int, owner, name: str):
+        self.due = due
+        self.sequence = sequence
+        self.owner = owner
+        self.name = name
+        self.cancelled = False
+
+    def __repr__(self):
+        return f"<Timer due={self.due} {type(self.owner).__name__}.{self.name}>"
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TimerWheel:
+    """
+    Calls `owner.name(scene, signal)` once its delay of simulated time has
+    passed.
+
+    `advance` is fed each update's time delta and turns the wheel one tick
+    per `resolution` seconds. Timers due on the same tick are called in
+    the order they were scheduled. A timer whose owner has left the scene
+    is dropped. A timer scheduled from a callback is due no sooner than the
+    next tick.
+    """
+
+    def __init__(self, resolution: float = values.timer_resolution,
+                 slots: int = values.timer_wheel_slots,
+                 levels: int = values.timer_wheel_levels):
+        self.resolution = resolution
+        self.slots = slots
+        self.spans = [slots ** level for level in range(levels)]
+        self.wheels = [[[] for _ in range(slots)] for _ in range(levels)]
+        self.tick = 0
+        self.elapsed = 0.0
+        self.sequence = count()
+
+    def __len__(self):
+        return sum(len(slot) for wheel in self.wheels for slot in wheel)
+
+    def __iter__(self):
+        """
+        Every timer still waiting, in the order they will be called.
+        """
+        timers = [timer for wheel in self.wheels for slot in wheel for timer in slot
+                  if not timer.cancelled]
+        return iter(sorted(timers, key=lambda timer: (timer.due, timer.sequence)))
+
+    def schedule(self, delay: float, owner, name: str) -> Timer:
+        return self.start(Timer(0, 0, owner, name), delay)
+
+    def start(self, timer: Timer, delay: float) -> Timer:
+        """
+        Schedule a timer made before it was due to be scheduled, `delay`
+        seconds from now, as the next in order.
+        """
+        ticks = max(1, ceil(delay / self.resolution - 1e-9))
+        timer.due = self.tick + ticks
+        timer.sequence = next(self.sequence)
+        return self.insert(timer)
+
+    def insert(self, timer: Timer) -> Timer:
+        due = timer.due
+        tick = self.tick
+        slots = self.slots
+        for level, span in enumerate(self.spans):
+            if due // (span * slots) == tick // (span * slots):
+                break
+        else:
+            level = len(self.spans) - 1
+        self.wheels[level][due // self.spans[level] % slots].append(timer)
+        return timer
+
+    def advance(self, time_delta: float, scene, signal):
+        self.elapsed += time_delta
+        while self.elapsed >= self.resolution - 1e-9:
+            self.elapsed -= self.resolution
+            self.turn(scene, signal)
+
+    def turn(self, scene, signal):
+        self.tick = tick = self.tick + 1
+        slots = self.slots
+        # Move timers down from every level whose slot just started, top first.
+        for level in range(len(self.spans) - 1, 0, -1):
+            span = self.spans[level]
+            if tick % span:
+                continue
+            wheel = self.wheels[level]
+            index = tick // span % slots
+            moving, wheel[index] = wheel[index], []
+            for timer in moving:
+                self.insert(timer)
+        wheel = self.wheels[0]
+        index = tick % slots
+        due, wheel[index] = wheel[index], []
+        if not due:
+            return
+        due.sort(key=lambda timer: timer.sequence)
+        for timer in due:
+            if timer.cancelled:
+                continue
+            if timer.due != tick:
+                self.insert(timer)
+                continue
+            owner = timer.owner
+            if owner is not scene and owner not in scene:
+                continue
+            getattr(owner, timer.name)(scene, signal)
+
+    def restore(self, tick: int, elapsed: float, timers):
+        """
+        Replace every timer with `timers`, as (due, owner, name), at `tick`.
+        """
+        self.wheels = [[[] for _ in range(self.slots)] for _ in self.spans]
+        self.tick = tick
+        self.elapsed = elapsed
+        self.sequence = count()
+        for due, owner, name in timers:
+            self.insert(Timer(due, next(self.sequence), owner, name))
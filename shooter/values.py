@@ -55,3 +55,90 @@ enemy_zero_points = 5
 enemy_zero_bonus = 20
 enemy_zero_speed = 4
 enemy_zero_watch_distance = 10
+
+# Simulation runs at a fixed tick independent of the render rate.
+simulation_rate = 120
+simulation_max_catch_up = 8
+# Per-tick acceleration factors below were tuned against ppb's 0.016s step.
+acceleration_time_step = 0.016
+
+# Timer wheel, one slot per simulation tick on the lowest level.
+timer_resolution = 1 / simulation_rate
+timer_wheel_slots = 64
+timer_wheel_levels = 4
+
+# Most recent input records kept by the controller.
+input_buffer_length = 64
+
+# Frame budget, non-critical sprites update less often when frames run over.
+frame_budget = 1 / 60
+frame_budget_window = 0.5
+frame_budget_max_shed = 3
+
+# Entity budget, spawns past these limits are refused.
+budget_total_limit = 160
+budget_priority_headroom = 20
+budget_enemy_limit = 24
+budget_friendly_limit = 60
+budget_enemy_bullet_limit = 40
+budget_missile_limit = 12
+budget_beacon_limit = 8
+
+# Inputs with no visible effect after this many seconds are not measured.
+latency_timeout = 1
+
+# Headless framebuffer observations, as a fraction of the window resolution.
+framebuffer_scale = 0.25
+
+# Telemetry rows buffered before a chunk is handed to the writer thread.
+telemetry_chunk_rows = 256
+
+# Parallel updates split the playfield into this many horizontal bands.
+# Each must be taller than two collision reaches, 2.5 units at most.
+parallel_bands = 6
+
+# Collision layers, one bit each. Sprites set a category of the layers they
+# are in and a mask of the layers they hit.
+layer_player = 1 << 0
+layer_shield = 1 << 1
+layer_enemy = 1 << 2
+layer_missile = 1 << 3
+layer_friendly_bullet = 1 << 4
+layer_enemy_bullet = 1 << 5
+layer_beacon = 1 << 6
+layer_life = 1 << 7
+layer_button = 1 << 8
+
+# Hitch watchdog, main loop cycles longer than this many seconds are reported.
+hitch_threshold = 0.02
+hitch_poll_interval = 0.005
+hitch_max_stacks = 5
+
+# Seconds between samples of the sampling profiler.
+profile_interval = 0.005
+
+# Most recent spans the event tracer keeps, to bound its memory and file.
+trace_max_spans = 100000
+
+# Seconds between statsd pushes of the metrics exporter.
+metrics_push_interval = 1
+
+# Performance overlay, toggled in game with its key.
+perf_overlay_refresh = 0.25
+perf_overlay_digit_size = 0.4
+perf_overlay_top_left = (-4.8, 8.6)
+
+# AI planner worker, enemies planned per snapshot and seconds to wait for it to stop.
+planner_max_enemies = 64
+planner_shutdown_timeout = 1
+
+# Co-op, space between the players' ships when they spawn.
+coop_spawn_spacing = 3
+
+# Rollback netplay. Local inputs apply this many ticks after they are read, a
+# peer runs at most this many ticks past the last input it has from the other,
+# and the peers compare state checksums every this many ticks.
+netplay_input_delay = 2
+netplay_max_rollback = 12
+netplay_checksum_interval = 60
+netplay_port = 7777
@@ -0,0 +1,89 @@
+from math import hypot
+
+from ppb import Vector
+
+__all__ = [
+    "MutableVector",
+]
+
+
+class MutableVector:
+    """
+    A 2D vector changed in place, for scratch math in the per frame path.
+
+    Every operation on `ppb.Vector` builds a new object. Sprites do their
+    intermediate steps on one of these instead and hand the engine a
+    `ppb.Vector` from `freeze` once they are done. Operations match their
+    `ppb.Vector` namesakes, but update and return the vector itself so they
+    chain.
+
+    Positions stay immutable `ppb.Vector`s, the interpolating renderer
+    keeps a reference to the last one.
+    """
+    __slots__ = ("x", "y")
+
+    def __init__(self, x: float = 0.0, y: float = 0.0):
+        self.x = x
+        self.y = y
+
+    def __iter__(self):
+        yield self.x
+        yield self.y
+
+    def __repr__(self):
+        return f"MutableVector({self.x}, {self.y})"
+
+    @property
+    def length(self) -> float:
+        return hypot(self.x, self.y)
+
+    def set(self, x: float, y: float) -> "MutableVector":
+        self.x = x
+        self.y = y
+        return self
+
+    def assign(self, vector) -> "MutableVector":
+        self.x = vector.x
+        self.y = vector.y
+        return self
+
+    def iadd(self, vector, factor: float = 1) -> "MutableVector":
+        """
+        Add `vector` scaled by `factor`.
+        """
+        self.x += vector.x * factor
+        self.y += vector.y * factor
+        return self
+
+    def isub(self, vector) -> "MutableVector":
+        self.x -= vector.x
+        self.y -= vector.y
+        return self
+
+    def scale_by(self, factor: float) -> "MutableVector":
+        self.x *= factor
+        self.y *= factor
+        return self
+
+    def scale_to(self, length: float) -> "MutableVector":
+        if length < 0:
+            raise ValueError("MutableVector.scale_to takes non-negative lengths.")
+        if length == 0:
+            return self.set(0.0, 0.0)
+        current = self.length
+        self.x = length * self.x / current
+        self.y = length * self.y / current
+        return self
+
+    scale = scale_to
+
+    def normalize(self) -> "MutableVector":
+        return self.scale_to(1)
+
+    def truncate(self, max_length: float) -> "MutableVector":
+        if self.length <= max_length:
+            return self
+        return self.scale_to(max_length)
+
+    def freeze(self) -> Vector:
+        return Vector(self.x, self.y)
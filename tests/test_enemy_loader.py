@@ -0,0 +1,46 @@
+import random
+from itertools import cycle
+
+from ppb import GameEngine
+from ppb import events as ppb_events
+from ppb.systemslib import System
+
+from shooter import systems
+from shooter.scene import Game
+from shooter.sprites import gameplay as game_sprites
+
+ticks = 600
+
+
+class SpawnLog(System):
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.spawns = []
+
+    def on_update(self, update: ppb_events.Update, signal):
+        enemies = update.scene.get(kind=game_sprites.EnemyShip)
+        self.spawns.append(sorted((type(enemy).__name__, enemy.position.y) for enemy in enemies))
+
+
+def play(idle_deltas):
+    random.seed(0)
+    engine = GameEngine(Game, basic_systems=[systems.FixedStepUpdater],
+                        systems=[systems.EnemyLoader, SpawnLog])
+    with engine:
+        engine.start()
+        engine.signal(ppb_events.SceneStarted())
+        log = next(system for system in engine.systems if isinstance(system, SpawnLog))
+        for time_delta in cycle(idle_deltas):
+            engine.signal(ppb_events.Idle(time_delta))
+            while engine.events:
+                engine.publish()
+            if len(log.spawns) >= ticks:
+                return log.spawns[:ticks]
+
+
+def test_spawns_follow_ticks_not_idle_time():
+    steady = play([1 / 120])
+    assert any(steady[-1])
+    # Includes idles too long to catch up on, where the game slows down.
+    assert play([0.004, 0.03, 0.2, 0.011]) == steady
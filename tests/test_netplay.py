@@ -0,0 +1,34 @@
+import random
+
+from shooter.netplay import LoopbackTransport
+from shooter.netplay import RollbackSession
+
+ticks = 600
+
+
+def play(latency, loss, seeds):
+    transports = LoopbackTransport.pair(latency, loss)
+    sessions = [RollbackSession(peer, transport, seed=seed)
+                for peer, (transport, seed) in enumerate(zip(transports, seeds))]
+    inputs = random.Random(0)
+    held = [(0, 0), (0, 0)]
+    for tick in range(ticks):
+        for peer, session in enumerate(sessions):
+            if inputs.random() < 0.05:
+                held[peer] = inputs.randint(-1, 1), inputs.randint(-1, 1)
+            session.advance(*held[peer], inputs.random() < 0.1)
+    for session in sessions:
+        session.close()
+    return sessions
+
+
+def test_peers_stay_in_sync_through_rollbacks():
+    for session in play(latency=4, loss=0.1, seeds=(1, 1)):
+        assert session.desynced is None
+        assert session.checked > 0
+        assert session.rollbacks > 0
+
+
+def test_desync_is_flagged():
+    for session in play(latency=4, loss=0, seeds=(1, 2)):
+        assert session.desynced is not None
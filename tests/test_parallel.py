@@ -0,0 +1,74 @@
+import random
+
+from ppb import GameEngine
+from ppb import Vector
+from ppb import events as ppb_events
+from ppb import keycodes
+
+from shooter import systems
+from shooter import values
+from shooter.controls import inputs
+from shooter.netplay import state_checksum
+from shooter.scene import Game
+from shooter.sprites import gameplay as game_sprites
+from shooter.systems.budget import Quota
+from shooter.systems.parallel import Band
+
+step = 1 / values.simulation_rate
+
+gameplay_systems = [
+    systems.ControllerSystem,
+    systems.LifeCounter,
+    systems.EnemyLoader,
+    systems.PowerUp,
+    systems.ScoringSystem,
+    systems.EnemyComms,
+    systems.Effects,
+    systems.EntityBudget,
+    systems.ParallelUpdater,
+]
+
+
+def drain(engine):
+    while engine.events:
+        engine.publish()
+
+
+def checksums(ticks=1200):
+    random.seed(0)
+    engine = GameEngine(Game, basic_systems=(), systems=gameplay_systems, inputs=inputs,
+                        parallel_threads=True)
+    sums = []
+    with engine:
+        engine.start()
+        engine.signal(ppb_events.SceneStarted())
+        drain(engine)
+        for tick in range(ticks):
+            if tick % 8 == 0:
+                engine.signal(ppb_events.KeyPressed(keycodes.Space, set()))
+            engine.signal(ppb_events.Idle(step))
+            engine.signal(ppb_events.Update(step))
+            drain(engine)
+            if tick % 60 == 0:
+                sums.append(state_checksum(engine.current_scene))
+    return sums
+
+
+def test_threaded_updates_are_deterministic():
+    assert checksums() == checksums()
+
+
+def test_band_spawns_are_admitted_at_merge():
+    scene = Game()
+    scene.entity_budget = systems.EntityBudget(
+        quotas=[Quota(values.layer_friendly_bullet, 3)]
+    )
+    bands = [Band(scene, signal=None), Band(scene, signal=None)]
+    # Each band was admitted two bullets against the empty scene.
+    for band in bands:
+        for _ in range(2):
+            band.add(game_sprites.Bullet(position=Vector(0, 0)))
+    for band in bands:
+        band.merge()
+    assert len(scene.layers[values.layer_friendly_bullet]) == 3
+    assert [len(band.added) for band in bands] == [2, 1]
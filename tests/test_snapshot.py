@@ -0,0 +1,75 @@
+import random
+
+from ppb import GameEngine
+from ppb import Vector
+from ppb import events as ppb_events
+from ppb import keycodes
+
+from shooter import systems
+from shooter.controls import inputs
+from shooter.events import EnemyKilled
+from shooter.events import SpawnEffect
+from shooter.scene import Game
+from shooter.snapshot import capture_state
+from shooter.snapshot import restore_snapshot
+from shooter.snapshot import restore_state
+from shooter.snapshot import take_snapshot
+from shooter.sprites import gameplay as game_sprites
+
+gameplay_systems = [
+    systems.ControllerSystem,
+    systems.LifeCounter,
+    systems.EnemyLoader,
+    systems.PowerUp,
+    systems.ScoringSystem,
+    systems.EnemyComms,
+    systems.Effects,
+    systems.EntityBudget,
+    systems.FrameBudgetScheduler,
+]
+
+
+def drain(engine):
+    while engine.events:
+        engine.publish()
+
+
+def played(ticks=600):
+    random.seed(0)
+    engine = GameEngine(Game, basic_systems=(), systems=gameplay_systems, inputs=inputs)
+    engine.__enter__()
+    engine.start()
+    engine.signal(ppb_events.SceneStarted())
+    drain(engine)
+    for tick in range(ticks):
+        if tick % 10 == 0:
+            engine.signal(ppb_events.KeyPressed(keycodes.Space, set()))
+        engine.signal(ppb_events.Idle(1 / 120))
+        engine.signal(ppb_events.Update(1 / 120))
+        drain(engine)
+    cargo = game_sprites.CargoShip(position=Vector(0, 5))
+    engine.current_scene.add(cargo)
+    engine.signal(SpawnEffect("enemy_explosion", cargo.position, end_event=EnemyKilled(cargo)))
+    drain(engine)
+    return engine
+
+
+def test_restored_state_captures_the_same():
+    engine = played()
+    state = capture_state(engine)
+    restore_state(engine, state)
+    assert capture_state(engine) == state
+    engine.__exit__(None, None, None)
+
+
+def test_snapshot_restores_events_with_fields():
+    engine = played()
+    snapshot = take_snapshot(engine)
+    restore_snapshot(engine, snapshot)
+    scene = engine.current_scene
+    effects = next(s for s in engine.systems if isinstance(s, systems.Effects))
+    killed = [e[4] for e in effects.effects if isinstance(e[4], EnemyKilled)]
+    assert len(killed) == 1
+    assert killed[0].enemy in scene
+    assert take_snapshot(engine) == snapshot
+    engine.__exit__(None, None, None)
@@ -0,0 +1,104 @@
+from shooter.timers import TimerWheel
+
+
+class Scene(set):
+    pass
+
+
+class Owner:
+
+    def __init__(self, name, calls):
+        self.name = name
+        self.calls = calls
+
+    def ring(self, scene, signal):
+        self.calls.append((self.name, scene.wheel.tick))
+
+
+def setup(*names):
+    calls = []
+    scene = Scene()
+    scene.wheel = TimerWheel(resolution=1, slots=64, levels=3)
+    owners = [Owner(name, calls) for name in names]
+    scene.update(owners)
+    return scene, owners, calls
+
+
+def turn_to(scene, tick):
+    while scene.wheel.tick < tick:
+        scene.wheel.advance(1, scene, None)
+
+
+def test_cascades_across_level_boundary():
+    scene, (owner,), calls = setup("a")
+    turn_to(scene, 63)
+    scene.wheel.schedule(1, owner, "ring")
+    turn_to(scene, 64)
+    assert calls == [("a", 64)]
+
+
+def test_cascades_from_top_level():
+    scene, (owner,), calls = setup("a")
+    turn_to(scene, 10)
+    scene.wheel.schedule(64 * 64 + 5, owner, "ring")
+    turn_to(scene, 64 * 64 + 14)
+    assert calls == []
+    turn_to(scene, 64 * 64 + 15)
+    assert calls == [("a", 64 * 64 + 15)]
+    assert len(scene.wheel) == 0
+
+
+def test_same_tick_fires_in_scheduled_order():
+    scene, owners, calls = setup("a", "b", "c")
+    # Scheduled at different levels, all due on tick 70.
+    scene.wheel.schedule(70, owners[2], "ring")
+    turn_to(scene, 60)
+    scene.wheel.schedule(10, owners[0], "ring")
+    turn_to(scene, 65)
+    scene.wheel.schedule(5, owners[1], "ring")
+    turn_to(scene, 70)
+    assert calls == [("c", 70), ("a", 70), ("b", 70)]
+
+
+def test_drops_timers_of_owners_that_left():
+    scene, (stays, leaves), calls = setup("stays", "leaves")
+    scene.wheel.schedule(3, stays, "ring")
+    scene.wheel.schedule(3, leaves, "ring")
+    scene.remove(leaves)
+    turn_to(scene, 3)
+    assert calls == [("stays", 3)]
+    assert len(scene.wheel) == 0
+
+
+def test_cancelled_timers_do_not_fire():
+    scene, (owner,), calls = setup("a")
+    scene.wheel.schedule(2, owner, "ring").cancel()
+    turn_to(scene, 5)
+    assert calls == []
+
+
+def test_timer_scheduled_from_callback_waits_a_tick():
+    scene, (owner,), calls = setup("a")
+
+    def ring_again(scene, signal):
+        owner.ring(scene, signal)
+        scene.wheel.schedule(0, owner, "ring")
+
+    owner.again = ring_again
+    scene.wheel.schedule(2, owner, "again")
+    turn_to(scene, 2)
+    assert calls == [("a", 2)]
+    turn_to(scene, 3)
+    assert calls == [("a", 2), ("a", 3)]
+
+
+def test_restore():
+    scene, (first, second), calls = setup("first", "second")
+    scene.wheel.schedule(5, first, "ring")
+    scene.wheel.restore(100, 0.5, [(200, second, "ring"), (101, first, "ring")])
+    assert [timer.due for timer in scene.wheel] == [101, 200]
+    assert scene.wheel.elapsed == 0.5
+    scene.wheel.advance(0.5, scene, None)
+    assert calls == [("first", 101)]
+    turn_to(scene, 200)
+    assert calls == [("first", 101), ("second", 200)]